@@ -73,10 +73,31 @@ import chess
 import chess.engine
 import chess.pgn
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from io import StringIO
 import os
 
+class _PlyCounter(chess.pgn.BaseVisitor):
+    """PGN visitor that counts mainline plies without parsing any SAN."""
+
+    def __init__(self):
+        self.plies = 0
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def begin_parse_san(self, board, san):
+        # Count the move but skip parse_san, the expensive part of reading PGN.
+        # A null move keeps the parser's move stack non-empty, which it
+        # checks before offering (and letting us skip) a variation.
+        self.plies += 1
+        board.push(chess.Move.null())
+        return chess.pgn.SKIP
+
+    def result(self) -> int:
+        return self.plies
+
+
 class ChessAnalyzer:
     """Analyzes chess games using Stockfish engine."""
 
@@ -130,9 +151,12 @@ class ChessAnalyzer:
 
         return None
 
-    def analyze_game(self, pgn: str, max_depth: int = 15) -> Dict:
-        """Analyze a complete game and return analysis results."""
-        game = chess.pgn.read_game(StringIO(pgn))
+    def analyze_game(self, pgn: Union[str, chess.pgn.Game], max_depth: int = 15) -> Dict:
+        """Analyze a complete game and return analysis results.
+
+        Accepts PGN text or an already-parsed game, which is only read.
+        """
+        game = pgn if isinstance(pgn, chess.pgn.Game) else chess.pgn.read_game(StringIO(pgn))
         if not game:
             return {"error": "Invalid PGN"}
 
@@ -144,32 +168,42 @@ class ChessAnalyzer:
             "summary": {}
         }
 
-        prev_score = 0
         move_number = 0
+        # Searches that raised; their positions score 0, so callers shouldn't
+        # trust (or cache) an analysis where this is non-zero
+        failed_searches = 0
+        self._ensure_engine()
+        # Decided once so a game never mixes engine and material scores
+        use_engine = self.engine is not None
+
+        # Evaluate the starting position once; after that, each move's "before"
+        # score is the previous move's "after" score, so every position is
+        # searched only once
+        if use_engine:
+            try:
+                info = self._search(board, max_depth)
+                prev_score = self._extract_engine_score(info)
+            except Exception:
+                prev_score = 0
+                failed_searches += 1
+        else:
+            # Simple material evaluation as a fallback (centipawns)
+            prev_score = self._material_eval(board)
 
         for move in game.mainline_moves():
             move_number += 1
             move_uci = move.uci()
 
             # Get evaluation before move
-            self._ensure_engine()
-            if self.engine:
-                try:
-                    info = self.engine.analyse(board, chess.engine.Limit(depth=max_depth))
-                    score_before = self._extract_engine_score(info)
-                except:
-                    score_before = 0
-            else:
-                # Simple material evaluation as a fallback (centipawns)
-                score_before = self._material_eval(board)
+            score_before = prev_score
 
             # Make the move
             board.push(move)
 
             # Get evaluation after move
-            if self.engine:
+            if use_engine:
                 try:
-                    info = self.engine.analyse(board, chess.engine.Limit(depth=max_depth))
+                    info = self._search(board, max_depth)
                     score_after = self._extract_engine_score(info)
                     pv = None
                     try:
@@ -178,9 +212,10 @@ class ChessAnalyzer:
                         pv = getattr(info, "pv", None)
                     first = pv[0] if pv else None
                     best_move_uci = first.uci() if hasattr(first, "uci") else None
-                except:
+                except Exception:
                     score_after = 0
                     best_move_uci = None
+                    failed_searches += 1
             else:
                 score_after = self._material_eval(board)
                 best_move_uci = None
@@ -213,11 +248,35 @@ class ChessAnalyzer:
             "total_moves": move_number,
             "blunder_count": len(analysis["blunders"]),
             "mistake_count": len(analysis["mistakes"]),
-            "accuracy": self._calculate_accuracy(analysis["moves"])
+            "accuracy": self._calculate_accuracy(analysis["moves"]),
+            "failed_searches": failed_searches
         }
 
         return analysis
 
+    def _search(self, board: chess.Board, max_depth: int):
+        """Run one engine search, replacing the engine if it has died.
+
+        The search still raises, but a fresh engine is started so later
+        positions (and games) are searched again instead of all failing.
+        """
+        if self.engine is None:
+            raise chess.engine.EngineTerminatedError("engine could not be restarted")
+        try:
+            return self.engine.analyse(board, chess.engine.Limit(depth=max_depth))
+        except chess.engine.EngineTerminatedError:
+            self._restart_engine()
+            raise
+
+    def _restart_engine(self):
+        """Discard a dead engine and start a new one if possible."""
+        engine, self.engine = self.engine, None
+        try:
+            engine.quit()
+        except Exception:
+            pass
+        self._ensure_engine()
+
     def _calculate_accuracy(self, moves: List[Dict]) -> float:
         """Calculate game accuracy based on move evaluations."""
         if not moves:
@@ -275,29 +334,28 @@ class ChessAnalyzer:
             
             return {
                 "score": score,
-                "best_move": best_move.uci() if best_move else None,
+                "best_move": best_move,
                 "depth": depth,
                 "fen": fen
             }
         except Exception as e:
             return {"error": str(e)}
 
-    def detect_blunders(self, pgn: str) -> List[Dict]:
+    def detect_blunders(self, pgn: Union[str, chess.pgn.Game]) -> List[Dict]:
         """Detect blunders in a game (moves with >200 cp loss)."""
         analysis = self.analyze_game(pgn)
         return analysis.get("blunders", [])
 
     def get_opening_classification(self, pgn: str) -> str:
         """Classify the opening phase of the game."""
-        game = chess.pgn.read_game(StringIO(pgn))
-        if not game:
+        # Only the ply count matters here, so moves are counted, not played
+        plies = chess.pgn.read_game(StringIO(pgn), Visitor=_PlyCounter)
+        if plies is None:
             return "Unknown"
 
-        moves = list(game.mainline_moves())
-        
-        if len(moves) <= 10:
+        if plies <= 10:
             return "Opening"
-        elif len(moves) <= 30:
+        elif plies <= 30:
             return "Middlegame"
         else:
             return "Endgame"
@@ -59,7 +59,7 @@ Dependencies:
 
 import time
 import requests
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional
 from datetime import datetime
 import configparser
 import os
@@ -261,14 +261,7 @@ class ChessComClient:
         """Get all games for a player, optionally filtered by date range.
 
         This is the main method for fetching a player's complete game history.
-        It retrieves games from all available monthly archives and optionally
-        filters them by date range.
-
-        The process:
-        1. Get list of all monthly archive URLs for the player
-        2. Fetch games from each archive (with rate limiting)
-        3. Combine all games into a single list
-        4. Apply date filtering if requested
+        It collects every batch from iter_games() into a single list.
 
         Args:
             username: Chess.com username to fetch games for
@@ -279,63 +272,122 @@ class ChessComClient:
             List of game dictionaries (same format as get_games_from_archive)
 
         Note: This can fetch hundreds or thousands of games depending on
-        the player's history. Consider using date filters for large datasets.
+        the player's history. Prefer iter_games() to process them
+        incrementally, or use date filters for large datasets.
         """
-        archives = self.get_game_archives(username)
         all_games = []
+        for games in self.iter_games(username, start_date=start_date, end_date=end_date):
+            all_games.extend(games)
+        return all_games
+
+    def iter_games(self, username: str, start_date: Optional[datetime] = None,
+                   end_date: Optional[datetime] = None,
+                   on_archive: Optional[Callable[[int, int], None]] = None) -> Iterator[List[Dict]]:
+        """Yield a player's games one monthly archive at a time.
+
+        The process:
+        1. Get list of all monthly archive URLs for the player
+        2. Skip archives whose month falls outside the requested range
+        3. Fetch games from each remaining archive (with rate limiting)
+        4. Apply date filtering and yield the archive's games
+
+        Callers can store each batch as it arrives, keeping memory bounded by
+        one month of games instead of the player's whole history.
+
+        Args:
+            username: Chess.com username to fetch games for
+            start_date: Optional start date filter (inclusive)
+            end_date: Optional end date filter (inclusive)
+            on_archive: Optional callback called as on_archive(done, total)
+                after each in-range archive is fetched, including empty or
+                failed ones, for progress reporting
 
-        for archive_url in archives:
+        Yields:
+            Non-empty lists of game dictionaries, one per monthly archive
+        """
+        keep = self._date_filter(start_date, end_date)
+        archives = [url for url in self.get_game_archives(username)
+                    if self._archive_in_range(url, start_date, end_date)]
+
+        for done, archive_url in enumerate(archives, 1):
             try:
                 games = self.get_games_from_archive(archive_url)
-                all_games.extend(games)
             except Exception as e:
                 print(f"Warning: Failed to fetch from {archive_url}: {e}")
-                continue
-
-        # Filter by date range if provided
-        if start_date or end_date:
-            # If both provided, include any game whose (year, month) falls within the range (inclusive)
-            if start_date and end_date:
-                # Build set of (year, month) between the two dates inclusive
-                months = set()
-                cur = datetime(start_date.year, start_date.month, 1)
-                end_marker = datetime(end_date.year, end_date.month, 1)
-                while cur <= end_marker:
-                    months.add((cur.year, cur.month))
-                    # Increment month
-                    if cur.month == 12:
-                        cur = datetime(cur.year + 1, 1, 1)
-                    else:
-                        cur = datetime(cur.year, cur.month + 1, 1)
-
-                filtered_games = []
-                for game in all_games:
-                    ts = game.get('end_time', 0)
-                    dt = datetime.utcfromtimestamp(ts)
-                    if (dt.year, dt.month) in months:
-                        filtered_games.append(game)
-                return filtered_games
-            else:
-                # Fallback: simple timestamp comparison when only one bound is provided
-                from datetime import timezone
-                if start_date and start_date.tzinfo is None:
-                    start_date = start_date.replace(tzinfo=timezone.utc)
-                if end_date and end_date.tzinfo is None:
-                    end_date = end_date.replace(tzinfo=timezone.utc)
-                start_ts = int(start_date.timestamp()) if start_date else None
-                end_ts = int(end_date.timestamp()) if end_date else None
-
-                filtered_games = []
-                for game in all_games:
-                    ts = int(game.get('end_time', 0))
-                    if start_ts is not None and ts < start_ts:
-                        continue
-                    if end_ts is not None and ts > end_ts:
-                        continue
-                    filtered_games.append(game)
-                return filtered_games
+                games = []
+
+            if on_archive:
+                on_archive(done, len(archives))
+            if keep:
+                games = [game for game in games if keep(game)]
+            if games:
+                yield games
+
+    @staticmethod
+    def _archive_in_range(archive_url: str, start_date: Optional[datetime],
+                          end_date: Optional[datetime]) -> bool:
+        """Check whether a .../games/{YYYY}/{MM} archive can hold games in range."""
+        try:
+            year, month = (int(part) for part in archive_url.rstrip('/').split('/')[-2:])
+        except ValueError:
+            return True  # Unrecognized URL shape; fetch it and filter by game
 
-        return all_games
+        if start_date and (year, month) < (start_date.year, start_date.month):
+            return False
+        if end_date and (year, month) > (end_date.year, end_date.month):
+            return False
+        return True
+
+    @staticmethod
+    def _date_filter(start_date: Optional[datetime],
+                     end_date: Optional[datetime]) -> Optional[Callable[[Dict], bool]]:
+        """Build a per-game predicate for the requested date range.
+
+        Returns:
+            None when no range was requested, otherwise a function that
+            returns True for games to keep
+        """
+        if not start_date and not end_date:
+            return None
+
+        # If both provided, include any game whose (year, month) falls within the range (inclusive)
+        if start_date and end_date:
+            # Build set of (year, month) between the two dates inclusive
+            months = set()
+            cur = datetime(start_date.year, start_date.month, 1)
+            end_marker = datetime(end_date.year, end_date.month, 1)
+            while cur <= end_marker:
+                months.add((cur.year, cur.month))
+                # Increment month
+                if cur.month == 12:
+                    cur = datetime(cur.year + 1, 1, 1)
+                else:
+                    cur = datetime(cur.year, cur.month + 1, 1)
+
+            def in_months(game: Dict) -> bool:
+                dt = datetime.utcfromtimestamp(game.get('end_time', 0))
+                return (dt.year, dt.month) in months
+
+            return in_months
+
+        # Fallback: simple timestamp comparison when only one bound is provided
+        from datetime import timezone
+        if start_date and start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=timezone.utc)
+        if end_date and end_date.tzinfo is None:
+            end_date = end_date.replace(tzinfo=timezone.utc)
+        start_ts = int(start_date.timestamp()) if start_date else None
+        end_ts = int(end_date.timestamp()) if end_date else None
+
+        def in_bounds(game: Dict) -> bool:
+            ts = int(game.get('end_time', 0))
+            if start_ts is not None and ts < start_ts:
+                return False
+            if end_ts is not None and ts > end_ts:
+                return False
+            return True
+
+        return in_bounds
 
     def test_authentication(self) -> bool:
         """Test if the current credentials work for authentication.
@@ -15,6 +15,9 @@ Core Features:
 Database Schema:
 - games: Stores complete game data (PGN, metadata, timestamps)
 - analysis_cache: Caches engine evaluations for performance
+- game_analysis_cache / ai_insights_cache: Whole-game analysis and AI insights
+  keyed by a SHA-256 of the PGN and the search depth so reruns skip the
+  engine and the Grok API
 - Indexes on key fields for fast querying
 - Foreign key relationships for data integrity
 
@@ -46,6 +49,13 @@ Usage Examples:
     # Cache analysis results
     db.cache_analysis(game_id, move_number, evaluation)
 
+    # Memoize AI insights per PGN
+    db.put_ai_cache(pgn_hash(pgn), depth, insights)
+
+    # Share pooled connections between worker threads
+    with get_pool().acquire(write=True) as db:
+        db.insert_games_batch(games_list)
+
 Security:
 - SQL injection prevention through parameterized queries
 - Safe path handling for bundled applications
@@ -56,20 +66,38 @@ Dependencies:
 - sqlite3: Built-in Python SQLite support
 - pathlib: Cross-platform path handling
 - datetime: Timestamp management
+- hashlib/json: Cache keys and serialized analysis results
 - typing: Type hints for better code documentation
 """
 
+import hashlib
+import json
 import sqlite3
 import sys
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime
 
+
+def pgn_hash(pgn: str) -> bytes:
+    """Return the SHA-256 digest used to key per-game caches."""
+    return hashlib.sha256(pgn.encode('utf-8')).digest()
+
+
 class ChessDatabase:
     """SQLite database for storing chess games and analysis."""
 
-    def __init__(self, db_path: str = "chess_games.db"):
-        """Initialize database connection."""
+    def __init__(self, db_path: str = "chess_games.db", check_same_thread: bool = True):
+        """Initialize database connection.
+
+        Args:
+            db_path: Path to the SQLite database file
+            check_same_thread: Set to False for connections that are handed
+                between threads (e.g. by ConnectionPool)
+        """
         # Handle PyInstaller bundle paths
         if getattr(sys, 'frozen', False):
             # Running in PyInstaller bundle
@@ -79,6 +107,7 @@ class ChessDatabase:
             # Running in development
             self.db_path = Path(db_path)
 
+        self.check_same_thread = check_same_thread
         self.conn = None
         try:
             self._create_tables()
@@ -89,8 +118,12 @@ class ChessDatabase:
     def _get_connection(self):
         """Get database connection."""
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=self.check_same_thread)
             self.conn.row_factory = sqlite3.Row  # Enable column access by name
+            # WAL lets readers proceed while a writer commits
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
         return self.conn
 
     def _create_tables(self):
@@ -126,6 +159,31 @@ class ChessDatabase:
             )
         ''')
 
+        # Whole-game analysis results, keyed by PGN hash and search depth
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS game_analysis_cache (
+                pgn_hash BLOB,
+                depth INTEGER,
+                analysis TEXT NOT NULL,  -- JSON-encoded analyze_game result
+                created_at REAL DEFAULT (datetime('now')),
+                PRIMARY KEY (pgn_hash, depth)
+            )
+        ''')
+
+        # AI insights, keyed like the analysis their prompt was built from.
+        # Replaces the depth-less ai_cache, whose entries may rest on
+        # material-only analyses.
+        cursor.execute('DROP TABLE IF EXISTS ai_cache')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ai_insights_cache (
+                pgn_hash BLOB,
+                depth INTEGER,
+                insights TEXT NOT NULL,
+                created_at REAL DEFAULT (datetime('now')),
+                PRIMARY KEY (pgn_hash, depth)
+            )
+        ''')
+
         conn.commit()
 
     def insert_game(self, game_data: Dict):
@@ -150,44 +208,68 @@ class ChessDatabase:
 
         conn.commit()
 
-    def insert_games_batch(self, games: List[Dict]):
-        """Insert multiple games into the database."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+    BATCH_SIZE = 1000  # Rows bound per executemany call
 
-        games_data = []
-        for game in games:
-            # Extract game_id from URL
-            game_id = game.get('url', '').split('/')[-1] if game.get('url') else ''
-            
-            # Extract result from PGN if not directly available
-            result = game.get('result', '')
-            if not result:
-                pgn = game.get('pgn', '')
-                # Parse result from PGN
-                for line in pgn.split('\n'):
-                    if line.startswith('[Result "'):
-                        result = line.split('"')[1]
-                        break
-            
-            games_data.append((
-                game_id,
-                game.get('pgn', ''),
-                game.get('end_time', 0),
-                result,
-                game.get('white', {}).get('username', ''),
-                game.get('black', {}).get('username', ''),
-                game.get('time_control', ''),
-                game.get('end_time', 0)
-            ))
-
-        cursor.executemany('''
+    def insert_games_batch(self, games: List[Dict]) -> int:
+        """Insert multiple games into the database in a single transaction.
+
+        Rows are bound in chunks of BATCH_SIZE to cap peak memory, but all
+        chunks share one commit so a large import costs a single disk sync.
+
+        Returns:
+            Number of rows written
+        """
+        conn = self._get_connection()
+        stored = 0
+
+        with conn:  # One transaction; rolled back if any chunk fails
+            batch = []
+            for game in games:
+                batch.append(self._game_row(game))
+                if len(batch) >= self.BATCH_SIZE:
+                    stored += self._insert_rows(conn, batch)
+                    batch = []
+            if batch:
+                stored += self._insert_rows(conn, batch)
+
+        return stored
+
+    @staticmethod
+    def _game_row(game: Dict) -> tuple:
+        """Convert a Chess.com game dict into a games table row."""
+        # Extract game_id from URL
+        game_id = game.get('url', '').split('/')[-1] if game.get('url') else ''
+
+        # Extract result from PGN if not directly available
+        result = game.get('result', '')
+        if not result:
+            pgn = game.get('pgn', '')
+            # Parse result from PGN
+            for line in pgn.split('\n'):
+                if line.startswith('[Result "'):
+                    result = line.split('"')[1]
+                    break
+
+        return (
+            game_id,
+            game.get('pgn', ''),
+            game.get('end_time', 0),
+            result,
+            game.get('white', {}).get('username', ''),
+            game.get('black', {}).get('username', ''),
+            game.get('time_control', ''),
+            game.get('end_time', 0)
+        )
+
+    @staticmethod
+    def _insert_rows(conn, rows: List[tuple]) -> int:
+        """Write a chunk of game rows and return how many were stored."""
+        cursor = conn.executemany('''
             INSERT OR REPLACE INTO games
             (game_id, pgn, date, result, white_username, black_username, time_control, end_time)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', games_data)
-
-        conn.commit()
+        ''', rows)
+        return cursor.rowcount
 
     def get_games_by_username(self, username: str, limit: Optional[int] = None) -> List[Dict]:
         """Get games for a specific username."""
@@ -277,6 +359,41 @@ class ChessDatabase:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+    def get_game_analysis_cache(self, digest: bytes, depth: int) -> Optional[Dict]:
+        """Get a cached whole-game analysis for a pgn_hash() digest and depth."""
+        conn = self._get_connection()
+        row = conn.execute('''
+            SELECT analysis FROM game_analysis_cache
+            WHERE pgn_hash = ? AND depth = ?
+        ''', (digest, depth)).fetchone()
+        return json.loads(row['analysis']) if row else None
+
+    def put_game_analysis_cache(self, digest: bytes, depth: int, analysis: Dict):
+        """Cache a whole-game analysis for a pgn_hash() digest and depth."""
+        conn = self._get_connection()
+        with conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO game_analysis_cache (pgn_hash, depth, analysis)
+                VALUES (?, ?, ?)
+            ''', (digest, depth, json.dumps(analysis)))
+
+    def get_ai_cache(self, digest: bytes, depth: int) -> Optional[str]:
+        """Get cached AI insights for a pgn_hash() digest and analysis depth."""
+        conn = self._get_connection()
+        row = conn.execute(
+            'SELECT insights FROM ai_insights_cache WHERE pgn_hash = ? AND depth = ?', (digest, depth)
+        ).fetchone()
+        return row['insights'] if row else None
+
+    def put_ai_cache(self, digest: bytes, depth: int, insights: str):
+        """Cache AI insights for a pgn_hash() digest and analysis depth."""
+        conn = self._get_connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO ai_insights_cache (pgn_hash, depth, insights) VALUES (?, ?, ?)',
+                (digest, depth, insights)
+            )
+
     def close(self):
         """Close database connection."""
         if self.conn:
@@ -286,3 +403,62 @@ class ChessDatabase:
     def __del__(self):
         """Ensure connection is closed on deletion."""
         self.close()
+
+
+class ConnectionPool:
+    """Pool of open ChessDatabase handles shared by background workers.
+
+    Writes go through a single dedicated connection serialized by a lock,
+    while reads are served from a queue of reader connections so game scans
+    can run alongside inserts (the database runs in WAL mode).
+    """
+
+    def __init__(self, db_path: str = "chess_games.db", readers: int = 4):
+        """Open the writer and reader connections up front.
+
+        Args:
+            db_path: Path to the SQLite database file
+            readers: Number of reader connections to keep open
+        """
+        self.db_path = db_path
+        self._writer = ChessDatabase(db_path, check_same_thread=False)
+        self._write_lock = threading.Lock()
+        self._readers = queue.Queue()
+        for _ in range(readers):
+            self._readers.put(ChessDatabase(db_path, check_same_thread=False))
+
+    @contextmanager
+    def acquire(self, write: bool = False) -> Iterator[ChessDatabase]:
+        """Borrow a database handle for the duration of a with-block.
+
+        Args:
+            write: Borrow the writer connection instead of a reader
+        """
+        if write:
+            with self._write_lock:
+                yield self._writer
+            return
+
+        db = self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put(db)
+
+    def close(self):
+        """Close every pooled connection."""
+        self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Return the shared connection pool, opening it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
@@ -8,26 +8,44 @@ Provides a local web UI to:
 Notes:
 - Runs locally; no credentials are transmitted externally
 - Uses SQLite for local storage
-- Designed for responsiveness with background threads and progress polling
+- Designed for responsiveness with background jobs and streamed progress (SSE)
 """
 
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from flask import Flask, Response, request, jsonify, flash, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from waitress import serve
+from werkzeug.debug import DebuggedApplication
+from werkzeug.serving import make_server
 import os
 import sys
+import argparse
+import gzip
+import socket
 import threading
 import time
+import webbrowser
 import configparser
 import logging
+import secrets
+import uuid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from multiprocessing.util import Finalize
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Optional; responses fall back to the stdlib json module
+    orjson = None
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from api.client import ChessComClient
-from db.database import ChessDatabase
-from analysis.analyzer import ChessAnalyzer
-from ai.grok_client import GrokClient
+from db.database import get_pool, pgn_hash
 
 app = Flask(__name__)
 CORS(app, resources={
@@ -44,10 +62,61 @@ CORS(app, resources={
         "supports_credentials": True
     }
 })
+
+class _ORJSONProvider(DefaultJSONProvider):
+    """Flask's default JSON provider with orjson doing the encoding and decoding.
+
+    Dates still go through the default provider's hook so responses are
+    unchanged; pretty-printed (debug) output is left to the stdlib.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent') is not None:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = _ORJSONProvider(app)
+
 # Use a secure random secret key for sessions
-import secrets
 app.secret_key = secrets.token_hex(32)
 
+# Templates never change at runtime outside --dev mode, so skip Jinja's
+# per-render freshness checks
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+
+SERVER_HOST = '127.0.0.1'
+DEFAULT_PORT = 5000  # Used when free, otherwise the OS picks a port
+SERVER_THREADS = 8  # Request threads for the production WSGI server
+
+# Serializes credential updates against requests made with current_client
+_client_lock = threading.RLock()
+
+# Saved credentials, parsed from config.local.ini on first load
+CONFIG_PATH = Path(__file__).parent.parent / 'config.local.ini'
+_cred_cache = None
+_cred_lock = threading.Lock()
+
+# The index page is static HTML, so it is read once and served from memory,
+# alongside a gzip copy compressed once rather than on every request
+INDEX_PATH = Path(__file__).parent / 'templates' / 'index.html'
+INDEX_MAX_AGE = 3600  # Seconds browsers may reuse the page without refetching
+_INDEX_HTML = None
+_INDEX_GZ = None
+
+def _set_index_html(html):
+    """Cache the index page and its precompressed gzip body."""
+    global _INDEX_HTML, _INDEX_GZ
+    _INDEX_HTML = html
+    _INDEX_GZ = gzip.compress(html.encode('utf-8'), compresslevel=9, mtime=0)
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
@@ -56,20 +125,163 @@ logger = logging.getLogger(__name__)
 current_client = None
 current_analyzer = None
 current_ai = None
+_init_lock = threading.Lock()
 analysis_progress = {"status": "idle", "progress": 0, "message": ""}
 
+# Background jobs report progress under their own job id so concurrent jobs
+# don't overwrite each other. analysis_progress mirrors the most recently
+# started job for clients that poll without a job id.
+MAX_TRACKED_JOBS = 50
+job_progress = {}
+_latest_job_id = None
+
+# Guards job_progress/analysis_progress and is notified on every progress
+# update so /api/progress/stream can push changes. States are swapped in
+# whole and copied out on read, so readers always see a consistent snapshot.
+_progress_changed = threading.Condition()
+SSE_KEEPALIVE = 15  # Seconds between keep-alive comments on idle streams
+
+# Engine analysis is CPU-bound, so games are fanned out over a process pool.
+# Each worker process keeps one analyzer (and its Stockfish subprocess) alive
+# for every game it handles instead of paying engine startup per game.
+ANALYSIS_WORKERS = os.cpu_count() or 1
+ANALYSIS_DEPTH = 12  # Per-position depth cap to keep per-game latency bounded
+SINGLE_GAME_DEPTH = 15  # Single-game requests can afford a deeper search
+EXECUTOR = None
+_worker_analyzer = None
+
+# AI insight calls are network-bound and rate-limited, so they run on a small
+# thread pool of their own, overlapping with engine analysis.
+AI_MAX_CONCURRENCY = 2
+AI_EXECUTOR = ThreadPoolExecutor(max_workers=AI_MAX_CONCURRENCY, thread_name_prefix="ai-insights")
+
+def _spawn_stockfish():
+    """Process pool initializer: start one analyzer/engine per worker."""
+    global _worker_analyzer
+    from analysis.analyzer import ChessAnalyzer
+    _worker_analyzer = ChessAnalyzer()
+    _worker_analyzer._ensure_engine()
+    # Pool workers exit without running atexit hooks; quit the engine from a
+    # multiprocessing finalizer so Stockfish isn't left running
+    Finalize(_worker_analyzer, _worker_analyzer.close, exitpriority=10)
+
+def _analyze_one(pgn):
+    """Analyze a single PGN inside a pool worker using its resident engine.
+
+    Returns:
+        Tuple of (analysis, cacheable); see _analysis_cacheable.
+    """
+    analysis = _worker_analyzer.analyze_game(pgn, max_depth=ANALYSIS_DEPTH)
+    return analysis, _analysis_cacheable(analysis, _worker_analyzer)
+
+def _analysis_cacheable(analysis, analyzer):
+    """Whether every position in an analysis was searched by the engine.
+
+    Material-only fallbacks, and analyses where a search failed and scored
+    0, are never cached; a rerun would keep serving them.
+    """
+    return (analyzer.engine is not None and "error" not in analysis
+            and not analysis.get("summary", {}).get("failed_searches"))
+
+def _ai_insights_cacheable(analysis, insights, analysis_cacheable):
+    """Whether AI insights can be cached alongside their analysis.
+
+    They must come from the Grok API rather than the local fallback, and the
+    analysis the prompt was built from must be cacheable itself; advice on a
+    material-only analysis would otherwise outlive a Stockfish install.
+    """
+    return (analysis_cacheable and current_ai.is_available()
+            and insights != current_ai._get_fallback_advice(analysis))
+
+def _get_executor():
+    """Return the shared analysis process pool, creating it on first use.
+
+    Workers, each with a Stockfish process, start only once analysis is
+    requested, so launching the UI to browse or fetch games stays cheap.
+    """
+    global EXECUTOR
+    if EXECUTOR is None:
+        EXECUTOR = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, initializer=_spawn_stockfish)
+    return EXECUTOR
+
+def _reset_executor(executor):
+    """Discard a broken analysis pool so the next _get_executor() starts afresh.
+
+    A worker that dies (an engine crash, the OOM killer) breaks the whole
+    pool, and every later submit to it fails.
+    """
+    global EXECUTOR
+    if EXECUTOR is executor:
+        EXECUTOR = None
+    executor.shutdown(wait=False)
+
+def _set_progress(job_id, state):
+    """Record the progress state of a background job."""
+    global analysis_progress
+    state = dict(state)
+    with _progress_changed:
+        job_progress[job_id] = state
+        if job_id == _latest_job_id:
+            analysis_progress = state
+        _progress_changed.notify_all()
+
+def _get_progress(job_id=None):
+    """Return a snapshot of a job's progress, or of the latest job by default.
+
+    Returns None if job_id is given but unknown.
+    """
+    with _progress_changed:
+        state = job_progress.get(job_id) if job_id else analysis_progress
+        return dict(state) if state is not None else None
+
+def _start_job(worker):
+    """Run worker(job_id) on a background thread and return the new job id.
+
+    With app.config['SYNC_BACKGROUND'] set, the worker runs inline instead.
+    """
+    global _latest_job_id
+    job_id = uuid.uuid4().hex
+    with _progress_changed:
+        _latest_job_id = job_id
+        # Forget the oldest jobs so the registry stays bounded
+        while len(job_progress) >= MAX_TRACKED_JOBS:
+            job_progress.pop(next(iter(job_progress)))
+    _set_progress(job_id, {"status": "queued", "progress": 0, "message": "Queued..."})
+
+    if app.config.get('SYNC_BACKGROUND'):
+        # Tests set this to finish the job before the request returns
+        worker(job_id)
+    else:
+        thread = threading.Thread(target=worker, args=(job_id,))
+        thread.daemon = True
+        thread.start()
+    return job_id
+
 def initialize_components():
-    """Initialize all Chess Analyzer components."""
+    """Initialize any Chess Analyzer components not created yet.
+
+    Safe to call repeatedly: routes that need the components call it on
+    demand. The engine and AI modules are imported here rather than at module
+    import so lightweight endpoints never load them.
+    """
     global current_client, current_analyzer, current_ai
 
-    try:
-        current_client = ChessComClient()
-        current_analyzer = ChessAnalyzer()
-        current_ai = GrokClient()
-        return True
-    except Exception as e:
-        print(f"Error initializing components: {e}")
-        return False
+    with _init_lock:
+        try:
+            if current_client is None:
+                current_client = ChessComClient()
+            if current_analyzer is None:
+                from analysis.analyzer import ChessAnalyzer
+                current_analyzer = ChessAnalyzer()
+            if current_ai is None:
+                from ai.grok_client import GrokClient
+                current_ai = GrokClient()
+            # Open the database connection pool up front
+            get_pool()
+            return True
+        except Exception as e:
+            print(f"Error initializing components: {e}")
+            return False
 
 @app.route('/')
 def index():
@@ -83,10 +295,23 @@ def index():
     - Manage credentials
 
     Returns:
-        Rendered HTML template for the main application interface
+        Cached HTML for the main application interface
     """
     logger.info("Serving index page")
-    return render_template('index.html')
+    if _INDEX_HTML is None or app.config['TEMPLATES_AUTO_RELOAD']:
+        _set_index_html(INDEX_PATH.read_text(encoding='utf-8'))
+
+    if request.accept_encodings['gzip']:
+        response = Response(_INDEX_GZ, mimetype='text/html', direct_passthrough=True)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Content-Length'] = str(len(_INDEX_GZ))
+    else:
+        response = Response(_INDEX_HTML, mimetype='text/html')
+    # In --dev mode template edits must show up on the next reload
+    if not app.config['TEMPLATES_AUTO_RELOAD']:
+        response.headers['Cache-Control'] = f'public, max-age={INDEX_MAX_AGE}'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 @app.route('/test')
 def test():
@@ -110,8 +335,6 @@ def get_demo_games():
     Returns a list of sample game data that can be inserted into the database
     for testing the analysis features when Chess.com API is unavailable.
     """
-    import time
-    
     # Sample PGN games for demonstration
     demo_games = [
         {
@@ -187,40 +410,45 @@ def fetch_games():
     if not username and fetch_mode != 'demo':
         return jsonify({"success": False, "error": "Please enter a username"})
 
+    # Build the client and open the database only for valid requests
+    initialize_components()
+
     # Background worker function for non-blocking game fetching
-    def fetch_worker():
-        global analysis_progress
+    def fetch_worker(job_id):
         try:
             # Initialize progress tracking
-            analysis_progress = {"status": "fetching", "progress": 0, "message": f"Checking for existing games for {username}..."}
+            _set_progress(job_id, {"status": "fetching", "progress": 0, "message": f"Checking for existing games for {username}..."})
 
-            # Create thread-safe database connection
-            from db.database import ChessDatabase
-            db = ChessDatabase()
+            # Chess.com requests can take minutes under rate limiting, so the
+            # pool's single writer is borrowed only for each write
+            def store(games):
+                with get_pool().acquire(write=True) as db:
+                    return db.insert_games_batch(games)
 
             # Check if games already exist for this username (skip if in "last" mode and games exist)
-            existing_games = db.get_games_by_username(username)
+            with get_pool().acquire() as db:
+                existing_games = db.get_games_by_username(username)
             if existing_games and fetch_mode == 'last':
-                db.close()
-                analysis_progress = {"status": "completed", "progress": 100, "message": f"Found {len(existing_games)} existing games for {username} (skipping fetch)"}
+                _set_progress(job_id, {"status": "completed", "progress": 100, "message": f"Found {len(existing_games)} existing games for {username} (skipping fetch)"})
                 return
 
             # Determine what to fetch based on mode
             if fetch_mode == 'last':
                 # Fetch only the most recent game
-                analysis_progress = {"status": "fetching", "progress": 10, "message": f"Fetching most recent game for {username}..."}
+                _set_progress(job_id, {"status": "fetching", "progress": 10, "message": f"Fetching most recent game for {username}..."})
 
                 try:
                     # Get the most recent archive
-                    archives = current_client.get_game_archives(username)
+                    with _client_lock:
+                        archives = current_client.get_game_archives(username)
                     if not archives:
-                        analysis_progress = {"status": "error", "progress": 0, "message": "No game archives found"}
-                        db.close()
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": "No game archives found"})
                         return
 
                     # Get the most recent archive (last in the list)
                     recent_archive_url = archives[-1]
-                    games = current_client.get_games_from_archive(recent_archive_url)
+                    with _client_lock:
+                        games = current_client.get_games_from_archive(recent_archive_url)
 
                     if games:
                         # Sort by end_time and take the most recent game
@@ -228,18 +456,16 @@ def fetch_games():
                         most_recent_game = games[0]
 
                         # Store only this game
-                        db.insert_games_batch([most_recent_game])
-                        stored_count = 1
+                        stored_count = store([most_recent_game])
                     else:
                         stored_count = 0
 
                 except Exception as e:
                     error_msg = str(e)
                     if "403" in error_msg or "Forbidden" in error_msg:
-                        analysis_progress = {"status": "error", "progress": 0, "message": f"Chess.com API blocked the request (403 Forbidden). Try using Demo Mode instead to test analysis features."}
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Chess.com API blocked the request (403 Forbidden). Try using Demo Mode instead to test analysis features."})
                     else:
-                        analysis_progress = {"status": "error", "progress": 0, "message": f"Failed to fetch recent game: {error_msg}"}
-                    db.close()
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Failed to fetch recent game: {error_msg}"})
                     return
 
             elif fetch_mode == 'range':
@@ -248,27 +474,43 @@ def fetch_games():
                 end_date_str = data.get('endDate')
 
                 if not start_date_str or not end_date_str:
-                    analysis_progress = {"status": "error", "progress": 0, "message": "Start and end dates are required"}
-                    db.close()
+                    _set_progress(job_id, {"status": "error", "progress": 0, "message": "Start and end dates are required"})
                     return
 
-                analysis_progress = {"status": "fetching", "progress": 10, "message": f"Fetching games from {start_date_str} to {end_date_str}..."}
+                _set_progress(job_id, {"status": "fetching", "progress": 10, "message": f"Fetching games from {start_date_str} to {end_date_str}..."})
 
                 try:
-                    from datetime import datetime
                     start_date = datetime.fromisoformat(start_date_str)
                     end_date = datetime.fromisoformat(end_date_str)
 
-                    games_data = current_client.get_all_games(username, start_date=start_date, end_date=end_date)
-                    stored_count = len(games_data) if games_data else 0
+                    # Store each monthly archive as it arrives instead of
+                    # collecting the whole history in memory first
+                    stored_count = 0
+
+                    def archive_fetched(done, total):
+                        _set_progress(job_id, {
+                            "status": "fetching",
+                            "progress": 10 + int(85 * done / total),
+                            "message": f"Fetched {done}/{total} monthly archives, stored {stored_count} games so far..."
+                        })
+
+                    # The lock covers each archive download, not the writes,
+                    # so a credential save waits one request at most
+                    archives = current_client.iter_games(username, start_date=start_date, end_date=end_date,
+                                                         on_archive=archive_fetched)
+                    while True:
+                        with _client_lock:
+                            games = next(archives, None)
+                        if games is None:
+                            break
+                        stored_count += store(games)
 
                 except Exception as e:
                     error_msg = str(e)
                     if "403" in error_msg or "Forbidden" in error_msg:
-                        analysis_progress = {"status": "error", "progress": 0, "message": f"Chess.com API blocked the request (403 Forbidden). Try using Demo Mode instead to test analysis features."}
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Chess.com API blocked the request (403 Forbidden). Try using Demo Mode instead to test analysis features."})
                     else:
-                        analysis_progress = {"status": "error", "progress": 0, "message": f"Failed to fetch games by date range: {error_msg}"}
-                    db.close()
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Failed to fetch games by date range: {error_msg}"})
                     return
 
             elif fetch_mode == 'days':
@@ -276,171 +518,243 @@ def fetch_games():
                 days = int(data.get('days', 5))
                 end_time = int(time.time())
                 start_time = end_time - (days * 24 * 60 * 60)
-                
+            
                 try:
-                    games_data = current_client.fetch_games_by_date_range(username, start_time, end_time)
+                    with _client_lock:
+                        games_data = current_client.fetch_games_by_date_range(username, start_time, end_time)
                     stored_count = len(games_data) if games_data else 0
                 except Exception as e:
                     error_msg = str(e)
                     if "403" in error_msg or "Forbidden" in error_msg:
-                        analysis_progress = {"status": "error", "progress": 0, "message": f"Chess.com API blocked the request (403 Forbidden). Try using Demo Mode instead to test analysis features."}
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Chess.com API blocked the request (403 Forbidden). Try using Demo Mode instead to test analysis features."})
                     else:
-                        analysis_progress = {"status": "error", "progress": 0, "message": f"Failed to fetch recent games: {error_msg}"}
-                    db.close()
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Failed to fetch recent games: {error_msg}"})
                     return
-                
+            
             elif fetch_mode == 'demo':
                 # Demo mode - add sample games for testing
                 games_data = get_demo_games()
                 stored_count = len(games_data) if games_data else 0
 
             else:
-                analysis_progress = {"status": "error", "progress": 0, "message": "Invalid fetch mode"}
-                db.close()
+                _set_progress(job_id, {"status": "error", "progress": 0, "message": "Invalid fetch mode"})
                 return
 
             # Store games in database
             if 'games_data' in locals() and games_data:
-                try:
-                    db.insert_games_batch(games_data)
-                finally:
-                    db.close()
+                stored_count = store(games_data)
 
             if stored_count > 0:
-                analysis_progress = {"status": "completed", "progress": 100, "message": f"Stored {stored_count} games for {username}"}
+                _set_progress(job_id, {"status": "completed", "progress": 100, "message": f"Stored {stored_count} games for {username}"})
             else:
-                analysis_progress = {"status": "completed", "progress": 100, "message": f"No new games found for {username}"}
+                _set_progress(job_id, {"status": "completed", "progress": 100, "message": f"No new games found for {username}"})
 
         except Exception as e:
-            analysis_progress = {"status": "error", "progress": 0, "message": f"Error: {str(e)}"}
+            _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Error: {str(e)}"})
 
-    thread = threading.Thread(target=fetch_worker)
-    thread.daemon = True
-    thread.start()
+    job_id = _start_job(fetch_worker)
 
-    return jsonify({"success": True, "message": "Fetching games..."})
+    return jsonify({"success": True, "message": "Fetching games...", "job_id": job_id})
 
 @app.route('/api/analyze_games', methods=['POST'])
 def analyze_games():
     """Analyze stored games for the provided username, or all games if no username specified."""
+    initialize_components()
 
     # Try to get username from request (optional)
     req_data = request.get_json(silent=True) or {}
     requested_username = (req_data.get('username') or "").strip()
 
-    def analyze_worker():
-        global analysis_progress
+    def analyze_worker(job_id):
         try:
-            analysis_progress = {"status": "analyzing", "progress": 0, "message": "Starting analysis..."}
-
-            # Create a new database connection for this thread
-            from db.database import ChessDatabase
-            db = ChessDatabase()
-
-            # Get games: either for specific username or all games
-            if requested_username:
-                games = db.get_games_by_username(requested_username)
-                if not games:
-                    analysis_progress = {"status": "error", "progress": 0, "message": f"No games found for username {requested_username}"}
-                    db.close()
-                    return
-            else:
-                # Get all games in database
-                games = db.get_all_games()
-                if not games:
-                    analysis_progress = {"status": "error", "progress": 0, "message": "No games found in database"}
-                    db.close()
-                    return
+            _set_progress(job_id, {"status": "analyzing", "progress": 0, "message": "Starting analysis..."})
+
+            # Borrow a pooled reader connection for this job
+            with get_pool().acquire() as db:
+                # Get games: either for specific username or all games
+                if requested_username:
+                    games = db.get_games_by_username(requested_username)
+                    if not games:
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": f"No games found for username {requested_username}"})
+                        return
+                else:
+                    # Get all games in database
+                    games = db.get_all_games()
+                    if not games:
+                        _set_progress(job_id, {"status": "error", "progress": 0, "message": "No games found in database"})
+                        return
+
+                # Reruns reuse earlier engine analysis and AI insights
+                hashes = [pgn_hash(game['pgn']) for game in games]
+                cached_analyses = [db.get_game_analysis_cache(h, ANALYSIS_DEPTH) for h in hashes]
+                cached_insights = [db.get_ai_cache(h, ANALYSIS_DEPTH) for h in hashes] if current_ai else []
 
             total_games = len(games)
-            analyzed_games = []
+            analyzed_games = [None] * total_games
+            # Cached analyses were cacheable when stored; new ones say so themselves
+            analysis_cacheable = [analysis is not None for analysis in cached_analyses]
+            new_analyses = []
+            new_insights = []
+            ai_futures = {}
+
+            _set_progress(job_id, {
+                "status": "analyzing",
+                "progress": 0,
+                "message": f"Analyzing {total_games} games..."
+            })
+
+            def record(i, analysis):
+                game = games[i]
+                analyzed_games[i] = {
+                    "game_id": game['game_id'],
+                    "result": game['result'],
+                    "white_username": game['white_username'],
+                    "black_username": game['black_username'],
+                    "analysis": analysis,
+                    "ai_insights": ""
+                }
 
-            for i, game in enumerate(games):
+                if current_ai:
+                    if cached_insights[i] is not None:
+                        analyzed_games[i]["ai_insights"] = cached_insights[i]
+                    else:
+                        # Request AI insights without waiting on the engine pool
+                        ai_futures[AI_EXECUTOR.submit(current_ai.get_chess_advice, game['pgn'], analysis)] = i
+
+            done = 0
+            for i, analysis in enumerate(cached_analyses):
+                if analysis is not None:
+                    record(i, analysis)
+                    done += 1
+
+            # Dispatch the remaining games to the engine pool and collect as
+            # they finish. If the pool breaks, replace it and retry the games
+            # it lost once.
+            pending = [i for i, analysis in enumerate(cached_analyses) if analysis is None]
+            for _ in range(2):
+                executor = _get_executor()
+                lost = []
                 try:
-                    analysis_progress = {
+                    futures = {executor.submit(_analyze_one, games[i]['pgn']): i for i in pending}
+                except BrokenProcessPool:
+                    futures, lost = {}, pending
+
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        analysis, analysis_cacheable[i] = future.result()
+                        record(i, analysis)
+                        if analysis_cacheable[i]:
+                            new_analyses.append((hashes[i], analysis))
+
+                    except BrokenProcessPool:
+                        lost.append(i)
+                        continue
+
+                    except Exception as e:
+                        print(f"Error analyzing game {games[i]['game_id']}: {e}")
+
+                    done += 1
+                    _set_progress(job_id, {
                         "status": "analyzing",
-                        "progress": int((i / total_games) * 100),
-                        "message": f"Analyzing game {i+1}/{total_games}..."
-                    }
-
-                    # Analyze the game
-                    analysis = current_analyzer.analyze_game(game['pgn'])
-
-                    # Get AI insights if available
-                    ai_insights = ""
-                    if current_ai:
-                        try:
-                            ai_insights = current_ai.get_chess_advice(game['pgn'], analysis)
-                        except Exception as e:
-                            ai_insights = f"AI analysis not available: {str(e)}"
-
-                    analyzed_games.append({
-                        "game_id": game['game_id'],
-                        "result": game['result'],
-                        "white_username": game['white_username'],
-                        "black_username": game['black_username'],
-                        "analysis": analysis,
-                        "ai_insights": ai_insights
+                        "progress": int((done / total_games) * 100),
+                        "message": f"Analyzed game {done}/{total_games}..."
                     })
 
+                if not lost:
+                    break
+                _reset_executor(executor)
+                pending = lost
+            else:
+                for i in lost:
+                    print(f"Error analyzing game {games[i]['game_id']}: analysis pool crashed")
+
+            if ai_futures:
+                _set_progress(job_id, {"status": "analyzing", "progress": 100, "message": "Collecting AI insights..."})
+
+            for ai_future, i in ai_futures.items():
+                try:
+                    insights = ai_future.result()
+                    analyzed_games[i]["ai_insights"] = insights
+                    if _ai_insights_cacheable(analyzed_games[i]["analysis"], insights, analysis_cacheable[i]):
+                        new_insights.append((hashes[i], insights))
                 except Exception as e:
-                    print(f"Error analyzing game {game['game_id']}: {e}")
+                    analyzed_games[i]["ai_insights"] = f"AI analysis not available: {str(e)}"
+
+            if new_analyses or new_insights:
+                with get_pool().acquire(write=True) as db:
+                    for h, analysis in new_analyses:
+                        db.put_game_analysis_cache(h, ANALYSIS_DEPTH, analysis)
+                    for h, insights in new_insights:
+                        db.put_ai_cache(h, ANALYSIS_DEPTH, insights)
 
-            analysis_progress = {
+            # Keep results in the original game order
+            analyzed_games = [g for g in analyzed_games if g is not None]
+
+            _set_progress(job_id, {
                 "status": "completed",
                 "progress": 100,
                 "message": f"Analysis complete! Analyzed {len(analyzed_games)} games",
                 "results": analyzed_games
-            }
+            })
 
         except Exception as e:
-            analysis_progress = {"status": "error", "progress": 0, "message": f"Analysis error: {str(e)}"}
+            _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Analysis error: {str(e)}"})
 
-    thread = threading.Thread(target=analyze_worker)
-    thread.daemon = True
-    thread.start()
+    job_id = _start_job(analyze_worker)
 
-    return jsonify({"success": True, "message": "Starting analysis..."})
+    return jsonify({"success": True, "message": "Starting analysis...", "job_id": job_id})
 
 @app.route('/api/analyze_single_game', methods=['POST'])
 def analyze_single_game():
     """Analyze a single game by game_id."""
+    initialize_components()
     req_data = request.get_json(silent=True) or {}
     game_id = req_data.get('game_id', '').strip()
 
     if not game_id:
         return jsonify({"success": False, "error": "Game ID is required"})
 
-    def analyze_single_worker():
-        global analysis_progress
+    def analyze_single_worker(job_id):
         try:
-            analysis_progress = {"status": "analyzing", "progress": 0, "message": "Starting single game analysis..."}
-
-            # Create a new database connection for this thread
-            from db.database import ChessDatabase
-            db = ChessDatabase()
+            _set_progress(job_id, {"status": "analyzing", "progress": 0, "message": "Starting single game analysis..."})
+
+            # Borrow a pooled reader connection for this job
+            with get_pool().acquire() as db:
+                # Get the specific game from database
+                game = db.get_game_by_id(game_id)
+                if not game:
+                    _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Game {game_id} not found"})
+                    return
 
-            # Get the specific game from database
-            game = db.get_game_by_id(game_id)
-            if not game:
-                analysis_progress = {"status": "error", "progress": 0, "message": f"Game {game_id} not found"}
-                db.close()
-                return
+                h = pgn_hash(game['pgn'])
+                analysis = db.get_game_analysis_cache(h, SINGLE_GAME_DEPTH)
+                ai_insights = db.get_ai_cache(h, SINGLE_GAME_DEPTH) if current_ai else None
 
-            analysis_progress = {"status": "analyzing", "progress": 50, "message": "Analyzing game..."}
+            _set_progress(job_id, {"status": "analyzing", "progress": 50, "message": "Analyzing game..."})
 
-            # Analyze the game
-            analysis = current_analyzer.analyze_game(game['pgn'])
+            # Analyze the game unless an earlier run already did
+            analysis_cacheable = analysis is not None
+            if analysis is None:
+                analysis = current_analyzer.analyze_game(game['pgn'], max_depth=SINGLE_GAME_DEPTH)
+                analysis_cacheable = _analysis_cacheable(analysis, current_analyzer)
+                if analysis_cacheable:
+                    with get_pool().acquire(write=True) as db:
+                        db.put_game_analysis_cache(h, SINGLE_GAME_DEPTH, analysis)
 
             # Get AI insights if available
-            ai_insights = ""
-            if current_ai:
-                try:
-                    ai_insights = current_ai.get_chess_advice(game['pgn'], analysis)
-                except Exception as e:
-                    ai_insights = f"AI analysis not available: {str(e)}"
-
-            analysis_progress = {
+            if ai_insights is None:
+                ai_insights = ""
+                if current_ai:
+                    try:
+                        ai_insights = current_ai.get_chess_advice(game['pgn'], analysis)
+                        if _ai_insights_cacheable(analysis, ai_insights, analysis_cacheable):
+                            with get_pool().acquire(write=True) as db:
+                                db.put_ai_cache(h, SINGLE_GAME_DEPTH, ai_insights)
+                    except Exception as e:
+                        ai_insights = f"AI analysis not available: {str(e)}"
+
+            _set_progress(job_id, {
                 "status": "completed",
                 "progress": 100,
                 "message": f"Analysis complete for game {game_id}",
@@ -452,27 +766,78 @@ def analyze_single_game():
                     "analysis": analysis,
                     "ai_insights": ai_insights
                 }
-            }
-
-            db.close()
+            })
 
         except Exception as e:
-            analysis_progress = {"status": "error", "progress": 0, "message": f"Analysis error: {str(e)}"}
+            _set_progress(job_id, {"status": "error", "progress": 0, "message": f"Analysis error: {str(e)}"})
 
-    thread = threading.Thread(target=analyze_single_worker)
-    thread.daemon = True
-    thread.start()
+    job_id = _start_job(analyze_single_worker)
 
-    return jsonify({"success": True, "message": "Starting single game analysis..."})
+    return jsonify({"success": True, "message": "Starting single game analysis...", "job_id": job_id})
 
 @app.route('/api/progress')
 def get_progress():
-    """Get current analysis progress."""
-    return jsonify(analysis_progress)
+    """Get progress for a background job.
+
+    Query Parameters:
+        job_id: Job id returned when the job was started. Without it, the
+            most recently started job is reported.
+    """
+    job_id = request.args.get('job_id')
+    state = _get_progress(job_id)
+    if state is None:
+        return jsonify({"status": "error", "progress": 0, "message": f"Unknown job {job_id}"}), 404
+    return jsonify(state)
+
+@app.route('/api/progress/stream')
+def stream_progress():
+    """Stream progress for a background job as Server-Sent Events.
+
+    Pushes the job's state whenever it changes over a single connection and
+    closes the stream once the job completes or fails.
+
+    Query Parameters:
+        job_id: Job id returned when the job was started. Defaults to the
+            most recently started job; unknown ids get a 404.
+    """
+    job_id = request.args.get('job_id')
+    if job_id and _get_progress(job_id) is None:
+        return jsonify({"status": "error", "progress": 0, "message": f"Unknown job {job_id}"}), 404
+    job_id = job_id or _latest_job_id
+    # Reported if the job is pruned from the registry mid-stream; never fall
+    # back to another job's progress
+    expired = {"status": "error", "progress": 0, "message": f"Job {job_id} expired"}
+
+    def current_state():
+        return job_progress.get(job_id, expired) if job_id else analysis_progress
+
+    def generate():
+        last_state = None
+        while True:
+            with _progress_changed:
+                state = current_state()
+                if state is last_state:
+                    _progress_changed.wait(timeout=SSE_KEEPALIVE)
+                    state = current_state()
+
+            if state is last_state:
+                yield ": keepalive\n\n"
+                continue
+
+            last_state = state
+            yield f"data: {app.json.dumps(state)}\n\n"
+            if state.get("status") in ("completed", "error"):
+                return
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 @app.route('/api/save_credentials', methods=['POST'])
 def save_credentials():
     """Save Chess.com credentials."""
+    global _cred_cache
     data = request.get_json()
     username = data.get('username', '').strip()
     password = data.get('password', '')
@@ -480,10 +845,11 @@ def save_credentials():
     if not username:
         return jsonify({"success": False, "error": "Username is required"})
 
+    initialize_components()
+
     try:
         # Save to config file
-        import configparser
-        config_path = Path(__file__).parent.parent / 'config.local.ini'
+        config_path = CONFIG_PATH
 
         config = configparser.ConfigParser()
         if config_path.exists():
@@ -498,36 +864,55 @@ def save_credentials():
         with open(config_path, 'w') as f:
             config.write(f)
 
-        # Update client with new credentials
+        with _cred_lock:
+            _cred_cache = {"username": username, "password": password}
+
+        # Update client with new credentials, skipping no-op saves
         if current_client:
-            current_client.username = username
-            if password:
-                current_client.password = password
-                current_client._setup_authenticated_session()
+            with _client_lock:
+                unchanged = (current_client.username == username and
+                             (not password or current_client.password == password))
+                if not unchanged:
+                    current_client.username = username
+                    if password:
+                        current_client.password = password
+                        current_client._setup_authenticated_session()
 
         return jsonify({"success": True, "message": f"Credentials saved for {username}"})
 
     except Exception as e:
         return jsonify({"success": False, "error": f"Failed to save credentials: {str(e)}"})
 
-@app.route('/api/load_credentials')
-def load_credentials():
-    """Load saved credentials."""
-    try:
-        config_path = Path(__file__).parent.parent / 'config.local.ini'
+def _read_credentials():
+    """Read saved Chess.com credentials from config.local.ini."""
+    config_path = CONFIG_PATH
 
-        if not config_path.exists():
-            return jsonify({"username": "", "password": ""})
+    if not config_path.exists():
+        return {"username": "", "password": ""}
 
-        config = configparser.ConfigParser()
-        config.read(config_path)
+    config = configparser.ConfigParser()
+    config.read(config_path)
+
+    if 'chess_com' in config:
+        username = config['chess_com'].get('username', '')
+        password = config['chess_com'].get('password', '')
+        return {"username": username, "password": password}
 
-        if 'chess_com' in config:
-            username = config['chess_com'].get('username', '')
-            password = config['chess_com'].get('password', '')
-            return jsonify({"username": username, "password": password})
+    return {"username": "", "password": ""}
 
-        return jsonify({"username": "", "password": ""})
+@app.route('/api/load_credentials')
+def load_credentials():
+    """Load saved credentials.
+
+    The config file is parsed once and cached; save_credentials refreshes
+    the cache whenever it writes new values.
+    """
+    global _cred_cache
+    try:
+        with _cred_lock:
+            if _cred_cache is None:
+                _cred_cache = _read_credentials()
+            return jsonify(_cred_cache)
 
     except Exception as e:
         return jsonify({"username": "", "password": "", "error": str(e)})
@@ -535,11 +920,13 @@ def load_credentials():
 @app.route('/api/test_auth')
 def test_auth():
     """Test Chess.com authentication."""
+    initialize_components()
     if not current_client:
         return jsonify({"success": False, "message": "Client not initialized"})
 
     try:
-        success = current_client.test_authentication()
+        with _client_lock:
+            success = current_client.test_authentication()
         if success:
             return jsonify({"success": True, "message": "Authentication successful!"})
         else:
@@ -551,12 +938,9 @@ def test_auth():
 def get_games():
     """Get all stored games from the database."""
     try:
-        # Create thread-safe database connection
-        from db.database import ChessDatabase
-        db = ChessDatabase()
-        
-        # Get all games from database
-        games = db.get_all_games()
+        # Get all games from database using a pooled reader connection
+        with get_pool().acquire() as db:
+            games = db.get_all_games()
         return jsonify({
             "success": True,
             "games": games,
@@ -577,7 +961,10 @@ def create_templates():
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Chess Analyzer</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+    <link rel="preconnect" href="https://cdn.jsdelivr.net" crossorigin>
+    <link rel="preconnect" href="https://cdnjs.cloudflare.com" crossorigin>
+    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet"
+          integrity="sha384-1BmE4kWBq78iYhFldvKuhfTAU6auU8tT94WrHftjDbrCEXSU1oBoqyl2QvZ6jIW3" crossorigin="anonymous">
     <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
     <style>
         body {
@@ -789,9 +1176,10 @@ def create_templates():
         </div>
     </div>
 
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
+    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js" defer
+            integrity="sha384-ka7Sk0Gln4gmtz2MlQnikT1wXgYsOg+OMhuP+IlRH9sENBO0LRn5q+8nbTov4+1p" crossorigin="anonymous"></script>
     <script>
-        let progressInterval;
+        let progressSource;
 
         // Handle fetch mode changes
         document.addEventListener('DOMContentLoaded', function() {
@@ -907,7 +1295,7 @@ def create_templates():
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    startProgressTracking();
+                    startProgressTracking(data.job_id);
                 } else {
                     alert('Error: ' + data.error);
                 }
@@ -929,7 +1317,7 @@ def create_templates():
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    startProgressTracking();
+                    startProgressTracking(data.job_id);
                 } else {
                     alert('Error: ' + data.error);
                 }
@@ -948,7 +1336,7 @@ def create_templates():
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    startProgressTracking();
+                    startProgressTracking(data.job_id);
                 } else {
                     alert('Error: ' + data.error);
                 }
@@ -978,32 +1366,31 @@ def create_templates():
                 });
         }
 
-        function startProgressTracking() {
-            if (progressInterval) clearInterval(progressInterval);
-
-            progressInterval = setInterval(() => {
-                fetch('/api/progress')
-                    .then(response => response.json())
-                    .then(data => {
-                        document.getElementById('progressBar').style.width = data.progress + '%';
-                        document.getElementById('progressText').textContent = data.message;
-
-                        if (data.status === 'completed') {
-                            clearInterval(progressInterval);
-                            document.getElementById('progressSection').style.display = 'none';
-
-                            if (data.results) {
-                                displayResults(data.results);
-                            } else if (data.result) {
-                                displayResults([data.result]);
-                            }
-                        } else if (data.status === 'error') {
-                            clearInterval(progressInterval);
-                            document.getElementById('progressSection').style.display = 'none';
-                            alert('Error: ' + data.message);
-                        }
-                    });
-            }, 1000);
+        function startProgressTracking(jobId) {
+            if (progressSource) progressSource.close();
+
+            const streamUrl = jobId ? '/api/progress/stream?job_id=' + encodeURIComponent(jobId) : '/api/progress/stream';
+            progressSource = new EventSource(streamUrl);
+            progressSource.onmessage = event => {
+                const data = JSON.parse(event.data);
+                document.getElementById('progressBar').style.width = data.progress + '%';
+                document.getElementById('progressText').textContent = data.message;
+
+                if (data.status === 'completed') {
+                    progressSource.close();
+                    document.getElementById('progressSection').style.display = 'none';
+
+                    if (data.results) {
+                        displayResults(data.results);
+                    } else if (data.result) {
+                        displayResults([data.result]);
+                    }
+                } else if (data.status === 'error') {
+                    progressSource.close();
+                    document.getElementById('progressSection').style.display = 'none';
+                    alert('Error: ' + data.message);
+                }
+            };
         }
 
         function displayResults(results) {
@@ -1088,8 +1475,42 @@ def create_templates():
     with open(templates_dir / 'index.html', 'w') as f:
         f.write(index_html)
 
-def main():
-    """Main entry point for the web application."""
+    # Serve the freshly written page without re-reading it
+    _set_index_html(index_html)
+
+def _bind_listener():
+    """Open the web server's listening socket.
+
+    Prefers DEFAULT_PORT and lets the kernel assign a free port when it is
+    taken. The socket is listening before it is returned, so no other process
+    can claim the port between choosing it and starting the server.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    # On Windows SO_REUSEADDR would allow binding a port that is in use
+    if os.name != 'nt':
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        listener.bind((SERVER_HOST, DEFAULT_PORT))
+    except OSError:
+        listener.bind((SERVER_HOST, 0))
+    listener.listen(128)
+    return listener
+
+def main(argv=None):
+    """Main entry point for the web application.
+
+    Serves the app with the multi-threaded waitress WSGI server so progress
+    streams don't block other requests. Pass --dev to use the Flask debug
+    server with template reloading instead.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    parser = argparse.ArgumentParser(description="Chess Analyzer web interface")
+    parser.add_argument('--dev', action='store_true',
+                        help="Run the Flask development server with the debugger enabled")
+    args = parser.parse_args(argv)
+
     print("🚀 Starting Chess Analyzer Web Interface...")
     print("📱 Initializing components...")
 
@@ -1099,23 +1520,12 @@ def main():
 
     print("✅ Components initialized successfully")
 
-    # Try different ports if 5000 is in use
-    ports_to_try = [5000, 5001, 5002, 8080, 8000, 3000, 3001, 4000, 4001, 9000]
-    port = None
-
-    for try_port in ports_to_try:
-        try:
-            import socket
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', try_port))
-            port = try_port
-            break
-        except OSError:
-            continue
-
-    if port is None:
-        print("❌ Error: Could not find an available port")
+    try:
+        listener = _bind_listener()
+    except OSError as e:
+        print(f"❌ Error: Could not open a listening socket: {e}")
         return
+    port = listener.getsockname()[1]
 
     print(f"🌐 Starting web server on http://localhost:{port}")
     print("📝 Open your browser and navigate to the URL above")
@@ -1124,22 +1534,21 @@ def main():
     # Create templates if they don't exist
     create_templates()
 
-    # Write the port to a temp file for the launcher
-    import tempfile
-    port_file = Path(tempfile.gettempdir()) / "chess_analyzer_port.txt"
-    port_file.write_text(str(port))
-
-    # Open browser
-    import webbrowser
-    import time
-    time.sleep(1)  # Give server a moment to start
+    # The socket is already listening, so the kernel queues the browser's
+    # first request until the server starts accepting
     webbrowser.open(f'http://localhost:{port}')
     print(f"🌐 Opened web interface in browser at http://localhost:{port}")
 
-    app.run(debug=True, host='127.0.0.1', port=port, use_reloader=False)
-
-# Initialize components when the module is imported
-initialize_components()
+    if args.dev:
+        app.debug = True
+        app.config['TEMPLATES_AUTO_RELOAD'] = True
+        app.jinja_env.auto_reload = True
+        server = make_server(SERVER_HOST, port, DebuggedApplication(app, evalex=True),
+                             threaded=True, fd=listener.fileno())
+        server.serve_forever()
+    else:
+        serve(app, sockets=[listener], threads=SERVER_THREADS)
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()
     main()
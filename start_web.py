@@ -17,23 +17,45 @@ Features:
 - Error handling and user feedback
 """
 
+import hashlib
 import subprocess
 import sys
 import os
-import webbrowser
-import time
+import tempfile
 from pathlib import Path
 
+# Hash of the last requirements.txt installed successfully, and of the
+# interpreter it was installed into, so unchanged requirements skip pip on
+# later launches from the same environment
+REQUIREMENTS_STAMP = Path(tempfile.gettempdir()) / "chess_analyzer_reqs.sha"
+
 def install_dependencies():
-    """Install required Python dependencies."""
+    """Install required Python dependencies unless they are already up to date."""
+    digest = hashlib.sha256(Path("requirements.txt").read_bytes())
+    # Another venv or interpreter needs its own install
+    digest.update(f"\0{sys.executable}\0{sys.prefix}".encode())
+    req_hash = digest.hexdigest()
+    try:
+        if REQUIREMENTS_STAMP.read_text() == req_hash:
+            print("✅ Dependencies already up to date")
+            return True
+    except OSError:
+        pass  # No stamp yet
+
     print("📦 Installing/updating dependencies...")
 
     try:
-        # Upgrade pip first
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", "pip"])
-
-        # Install requirements
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # Install requirements without pip's own self-update check
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--no-input",
+            "-r", "requirements.txt"
+        ])
+
+        try:
+            REQUIREMENTS_STAMP.write_text(req_hash)
+        except OSError as e:
+            print(f"⚠️  Could not record installed requirements: {e}")
 
         print("✅ Dependencies installed successfully")
         return True
@@ -67,17 +89,6 @@ def start_web_app():
         print(f"❌ Error starting web app: {e}")
         return False
 
-def open_browser(port):
-    """Open the web interface in the default browser."""
-    try:
-        # Wait a moment for the server to start
-        time.sleep(3)
-        webbrowser.open(f'http://localhost:{port}')
-        print(f"🌐 Opened web interface in browser at http://localhost:{port}")
-    except Exception as e:
-        print(f"⚠️  Could not open browser automatically: {e}")
-        print(f"📱 Please open http://localhost:{port} in your web browser")
-
 def main():
     """Main launcher function."""
     print("🚀 Chess Analyzer Web Interface Launcher")
@@ -93,14 +104,6 @@ def main():
     if not install_dependencies():
         return False
 
-    # Open browser first
-    import tempfile
-    import time
-
-    # Wait for the port file to be created (in case it exists from previous run)
-    port_file = Path(tempfile.gettempdir()) / "chess_analyzer_port.txt"
-    port = 5000  # default fallback
-
     # Start the web application (this will block)
     return start_web_app()
 
@@ -0,0 +1,115 @@
+"""Stand-ins for web_app's backends, shared by the web tests."""
+
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+
+# Returned as-is by DummyAnalyzer; web_app only serializes it, never mutates it
+_ANALYSIS = {
+    'summary': {'total_moves': 2, 'blunder_count': 0, 'mistake_count': 0, 'accuracy': 100.0},
+    'blunders': [], 'mistakes': [], 'moves': []
+}
+
+
+class DummyClient:
+    """ChessComClient serving a single monthly archive holding one game."""
+
+    ARCHIVE_URL = 'https://api.chess.com/pub/player/testuser/games/2024/01'
+
+    def get_game_archives(self, username):
+        return [self.ARCHIVE_URL]
+
+    def get_games_from_archive(self, archive_url):
+        return [{
+            'url': 'https://www.chess.com/game/live/123',
+            'pgn': '1. e4 e5',
+            'end_time': 1704067200,
+            'result': '1-0',
+            'white': {'username': 'testuser'},
+            'black': {'username': 'opponent'},
+            'time_control': '600'
+        }]
+
+    def iter_games(self, username, start_date=None, end_date=None, on_archive=None):
+        archives = self.get_game_archives(username)
+        for done, archive_url in enumerate(archives, 1):
+            games = self.get_games_from_archive(archive_url)
+            if on_archive:
+                on_archive(done, len(archives))
+            yield games
+
+
+# A game as stored in the database, for seeding DummyDB
+STORED_GAME = {
+    'game_id': 'g1',
+    'pgn': '1. e4 e5',
+    'result': '1-0',
+    'white_username': 'testuser',
+    'black_username': 'opponent'
+}
+
+
+class DummyDB:
+    """ChessDatabase keeping games in a list, with empty caches."""
+
+    def __init__(self, games=()):
+        self.games = list(games)
+
+    def insert_games_batch(self, games):
+        self.games.extend(games)
+        return len(games)
+
+    def get_games_by_username(self, username, limit=None):
+        return list(self.games)
+
+    def get_game_analysis_cache(self, digest, depth):
+        return None
+
+    def get_ai_cache(self, digest, depth):
+        return None
+
+    def close(self):
+        return None
+
+
+class DummyPool:
+    """Stands in for db.database.ConnectionPool, handing out one dummy DB."""
+
+    def __init__(self, db):
+        self.db = db
+
+    @contextmanager
+    def acquire(self, write=False):
+        yield self.db
+
+
+class BrokenPool:
+    """ProcessPoolExecutor whose workers have died, failing every task."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool('A worker process terminated abruptly'))
+        return future
+
+    def shutdown(self, wait=True):
+        return None
+
+
+class DummyAnalyzer:
+    """ChessAnalyzer without an engine that reports every game as flawless."""
+
+    engine = None
+
+    def analyze_game(self, pgn, max_depth=15):
+        return _ANALYSIS
+
+
+class DummyAI:
+    """GrokClient without an API key."""
+
+    def is_available(self):
+        return False
+
+    def get_chess_advice(self, pgn, analysis):
+        return 'Advice'
@@ -0,0 +1,19 @@
+"""Helpers shared by the test modules."""
+
+import functools
+from io import StringIO
+
+import chess
+import chess.pgn
+
+
+_STARTPOS_FEN = chess.STARTING_FEN
+
+
+@functools.lru_cache(maxsize=32)
+def _parsed(pgn: str) -> chess.pgn.Game:
+    """Parse a PGN once per test session.
+
+    The returned game is shared between callers, so tests must not modify it.
+    """
+    return chess.pgn.read_game(StringIO(pgn))
@@ -0,0 +1,68 @@
+"""Shared pytest fixtures.
+
+Clients are built once per test module rather than once per test, and the
+Flask app once per session. Tests that need to change a shared instance
+should do so through monkeypatch so the change is undone afterwards.
+"""
+
+import pytest
+import responses
+
+from src.ai.grok_client import GrokClient
+from src.analysis.analyzer import ChessAnalyzer
+from src.api.client import ChessComClient
+
+
+@pytest.fixture
+def mocked_requests():
+    """Intercept HTTP calls made through requests.
+
+    Tests register the responses they expect with mocked_requests.add(); any
+    unregistered request fails, as does a registered one that is never made.
+    """
+    with responses.RequestsMock() as rsps:
+        yield rsps
+
+
+@pytest.fixture(scope="module")
+def grok_client():
+    """GrokClient shared by the tests in a module."""
+    return GrokClient()
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    """ChessAnalyzer shared by the tests in a module; its engine is closed afterwards."""
+    analyzer = ChessAnalyzer()
+    yield analyzer
+    analyzer.close()
+
+
+@pytest.fixture(scope="module")
+def _shared_api_client():
+    return ChessComClient()
+
+
+@pytest.fixture
+def api_client(_shared_api_client, monkeypatch):
+    """ChessComClient shared by the tests in a module.
+
+    The rate limiter's clock is reset for each test so tests don't wait out
+    the delay left behind by the previous one.
+    """
+    monkeypatch.setattr(_shared_api_client, 'last_request_time', 0)
+    return _shared_api_client
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The Flask application, imported and configured once per session."""
+    from src.web_app import app
+    app.config.update(TESTING=True)
+    return app
+
+
+@pytest.fixture
+def web_client(app):
+    """Flask test client for the web interface; cheap, so each test gets its own."""
+    return app.test_client()
@@ -1,26 +1,52 @@
 """Tests for chess game analysis."""
 
+import chess
+import chess.engine
 import pytest
-from unittest.mock import Mock, patch
 from src.analysis.analyzer import ChessAnalyzer
+from _helpers import _STARTPOS_FEN, _parsed
 
 
-class TestChessAnalyzer:
-    """Test cases for ChessAnalyzer."""
+# PGN corpora shared by the tests below
+_PGN_SHORT = '1. e4 e5'
+_PGN_OPENING = '1. e4 e5 2. Nf3 Nc6 3. Bb5'  # 5 plies
+_PGN_NXE4 = '1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Nxe4'  # Nxe4 is a blunder
+_PGN_MEDIUM = ('1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 '
+               '8. c3 O-O 9. h3 Nb8 10. d4 Nbd7')  # 20 plies
+_PGN_BLUNDERS = ('1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Nxe4 6. d4 b5 7. Bb3 d5 '
+                 '8. dxe5 Be6 9. c3 Bc5 10. Nbd2 O-O 11. Bc2 Nxf2')
+# Shortest games past each phase boundary in get_opening_classification
+_PGN_MIDDLEGAME = '1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1'  # 11 plies
+_PGN_ENDGAME = ('1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 '
+                '8. c3 O-O 9. h3 Nb8 10. d4 Nbd7 11. Nbd2 Bb7 12. Bc2 Re8 13. Nf1 Bf8 '
+                '14. Ng3 g6 15. a4 c5 16. d5')  # 31 plies
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.analyzer = ChessAnalyzer()
+def _engine_info(cp, best_move="e2e4"):
+    """Engine result shaped like python-chess's InfoDict, built once per test."""
+    return {
+        "score": chess.engine.PovScore(chess.engine.Cp(cp), chess.WHITE),
+        "pv": [chess.Move.from_uci(best_move)],
+    }
 
-    def teardown_method(self):
-        """Clean up after tests."""
-        self.analyzer.close()
 
-    def test_analyze_game_basic(self):
-        """Test basic game analysis without Stockfish."""
-        pgn = '1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 8. c3 O-O 9. h3 Nb8 10. d4 Nbd7'
+# The real lookup, kept for the one test that exercises it
+_find_stockfish = ChessAnalyzer._find_stockfish
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _no_stockfish_probe():
+    """Skip probing the filesystem and PATH for Stockfish in every analyzer."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ChessAnalyzer, "_find_stockfish", lambda self: None)
+        yield
+
 
-        result = self.analyzer.analyze_game(pgn)
+class TestChessAnalyzer:
+    """Test cases for ChessAnalyzer."""
+
+    def test_analyze_game_basic(self, analyzer):
+        """Test basic game analysis without Stockfish."""
+        result = analyzer.analyze_game(_parsed(_PGN_MEDIUM))
 
         assert 'moves' in result
         assert 'summary' in result
@@ -28,40 +54,50 @@ class TestChessAnalyzer:
         assert 'blunders' in result
         assert 'mistakes' in result
 
-    def test_analyze_game_with_blunders(self):
+    def test_analyze_game_with_blunders(self, analyzer):
         """Test analysis of a game with known blunders."""
         # A game with a clear blunder (hanging queen)
-        pgn = '1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Nxe4 6. d4 b5 7. Bb3 d5 8. dxe5 Be6 9. c3 Bc5 10. Nbd2 O-O 11. Bc2 Nxf2'
-
-        result = self.analyzer.analyze_game(pgn)
+        result = analyzer.analyze_game(_parsed(_PGN_BLUNDERS))
 
         # Should detect the Nxe4 blunder
         assert len(result['blunders']) > 0 or len(result['mistakes']) > 0
 
-    @patch('chess.engine.SimpleEngine.popen_uci')
-    def test_analyze_game_with_stockfish(self, mock_engine):
+    def test_analyze_game_with_stockfish(self, analyzer, monkeypatch, mocker):
         """Test analysis with mocked Stockfish engine."""
         # Mock the engine
-        mock_engine_instance = Mock()
-        mock_engine.return_value = mock_engine_instance
-
-        # Mock analysis results - create a proper mock structure
-        mock_info = Mock()
-        mock_score = Mock()
-        mock_score.score = Mock(return_value=100)
-        mock_relative = Mock()
-        mock_relative.score = mock_score
-        mock_info.score = mock_relative
-        mock_info.__getitem__ = Mock(return_value=mock_info)
-        mock_engine_instance.analyse.return_value = mock_info
-
-        pgn = '1. e4 e5'
-        result = self.analyzer.analyze_game(pgn, max_depth=10)
+        mock_engine = mocker.patch('chess.engine.SimpleEngine.popen_uci')
+        mock_engine_instance = mock_engine.return_value
+        # Keep the mocked engine from leaking into the shared analyzer
+        monkeypatch.setattr(analyzer, 'engine', None)
+        monkeypatch.setattr(analyzer, 'stockfish_path', analyzer.stockfish_path)
+
+        # Every search returns the same canned result
+        mock_engine_instance.analyse.return_value = _engine_info(100)
+
+        result = analyzer.analyze_game(_PGN_SHORT, max_depth=10)
 
         # Verify engine was called
         assert mock_engine_instance.analyse.call_count >= 2  # Called for each position
 
-    def test_calculate_accuracy(self):
+    def test_analyze_game_respawns_dead_engine(self, analyzer, monkeypatch, mocker):
+        """Test that a crashed engine is reported and replaced."""
+        popen_uci = mocker.patch('chess.engine.SimpleEngine.popen_uci')
+        dead, fresh = mocker.Mock(), mocker.Mock()
+        popen_uci.side_effect = [dead, fresh]
+        monkeypatch.setattr(analyzer, 'engine', None)
+        monkeypatch.setattr(analyzer, 'stockfish_path', analyzer.stockfish_path)
+
+        dead.analyse.side_effect = chess.engine.EngineTerminatedError('engine process died')
+        fresh.analyse.return_value = _engine_info(100)
+
+        result = analyzer.analyze_game(_PGN_SHORT, max_depth=10)
+
+        assert result['summary']['failed_searches'] == 1  # Only the start position
+        assert dead.quit.called
+        assert analyzer.engine is fresh
+        assert fresh.analyse.call_count == 2
+
+    def test_calculate_accuracy(self, analyzer):
         """Test accuracy calculation."""
         # Create mock moves with different score changes
         moves = [
@@ -72,77 +108,79 @@ class TestChessAnalyzer:
             {'score_change': 200},  # Blunder
         ]
 
-        accuracy = self.analyzer._calculate_accuracy(moves)
+        accuracy = analyzer._calculate_accuracy(moves)
 
         # Should be less than 100% due to mistakes
         assert 0 <= accuracy <= 100
         assert accuracy < 100  # Not perfect due to mistakes
 
-    def test_get_position_evaluation_without_engine(self):
+    def test_get_position_evaluation_without_engine(self, analyzer):
         """Test position evaluation without Stockfish."""
-        fen = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
-
-        result = self.analyzer.get_position_evaluation(fen)
+        result = analyzer.get_position_evaluation(_STARTPOS_FEN)
 
         assert 'error' in result
         assert 'Stockfish' in result['error']
 
-    @patch('chess.engine.SimpleEngine.popen_uci')
-    def test_get_position_evaluation_with_engine(self, mock_engine):
+    def test_get_position_evaluation_with_engine(self, analyzer, monkeypatch, mocker):
         """Test position evaluation with mocked Stockfish."""
-        mock_engine_instance = Mock()
-        mock_engine.return_value = mock_engine_instance
+        mock_engine = mocker.patch('chess.engine.SimpleEngine.popen_uci')
+        mock_engine_instance = mock_engine.return_value
+        # Keep the mocked engine from leaking into the shared analyzer
+        monkeypatch.setattr(analyzer, 'engine', None)
+        monkeypatch.setattr(analyzer, 'stockfish_path', analyzer.stockfish_path)
 
-        mock_info = Mock()
-        mock_score = Mock()
-        mock_score.score = Mock(return_value=150)
-        mock_relative = Mock()
-        mock_relative.score = mock_score
-        mock_info.score = mock_relative
-        mock_info.__getitem__ = Mock(return_value=mock_info)
-        mock_engine_instance.analyse.return_value = mock_info
+        mock_engine_instance.analyse.return_value = _engine_info(150)
 
-        fen = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
-
-        result = self.analyzer.get_position_evaluation(fen)
+        result = analyzer.get_position_evaluation(_STARTPOS_FEN)
 
         assert 'score' in result
-        assert 'best_move' in result
+        assert result['best_move'] == 'e2e4'
         assert result['score'] == 150
 
-    def test_detect_blunders(self):
+    def test_detect_blunders(self, analyzer):
         """Test blunder detection."""
-        pgn = '1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Nxe4'  # Nxe4 is a blunder
-
-        blunders = self.analyzer.detect_blunders(pgn)
+        blunders = analyzer.detect_blunders(_PGN_NXE4)
 
         # Should detect at least one blunder
         assert isinstance(blunders, list)
 
-    def test_get_opening_classification(self):
+    def test_analyze_game_accepts_parsed_game(self, analyzer):
+        """Test that a parsed game is analyzed the same as its PGN text."""
+        assert analyzer.analyze_game(_parsed(_PGN_NXE4)) == analyzer.analyze_game(_PGN_NXE4)
+
+    def test_get_opening_classification(self, analyzer):
         """Test opening phase classification."""
         # Short game (opening)
-        short_pgn = '1. e4 e5 2. Nf3 Nc6 3. Bb5'
-        result = self.analyzer.get_opening_classification(short_pgn)
+        result = analyzer.get_opening_classification(_PGN_OPENING)
         assert result == 'Opening'
 
-        # Longer game (middlegame)
-        long_pgn = '1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6 5. O-O Be7 6. Re1 b5 7. Bb3 d6 8. c3 O-O 9. h3 Nb8 10. d4 Nbd7 11. Nbd2 Bb7 12. Bc2 Re8 13. Nf1 Bf8 14. Ng3 g6 15. a4 c5 16. d5 c4 17. Bg5 h6 18. Bh4 Nh5 19. Nxh5 gxh5 20. Qd2 Kh7 21. Kh2 Rg8 22. Rae1 Qe7 23. f4 exf4 24. Rxf4 Be5 25. Bxf6 Bxf6 26. Rxf6 Qxf6 27. Rxe8 Rxe8 28. Qxh6+ Kg8 29. Qxf6 Re2 30. Qg5+ Kh7'
-        result = self.analyzer.get_opening_classification(long_pgn)
-        assert result in ['Middlegame', 'Endgame']
+        # One ply past the opening
+        result = analyzer.get_opening_classification(_PGN_MIDDLEGAME)
+        assert result == 'Middlegame'
+
+        # One ply past the middlegame
+        result = analyzer.get_opening_classification(_PGN_ENDGAME)
+        assert result == 'Endgame'
+
+    def test_get_opening_classification_ignores_variations(self, analyzer):
+        """Test that only mainline moves count toward the game phase."""
+        # 10 mainline plies with a long sideline that would push it past the opening
+        pgn = ('1. e4 e5 2. Nf3 {main line} Nc6 3. Bb5 a6 4. Ba4 Nf6 '
+               '(4... d6 5. c3 Bd7 6. d4 Nge7 7. O-O Ng6 8. Re1 Be7) 5. O-O Be7')
+        assert analyzer.get_opening_classification(pgn) == 'Opening'
 
-    def test_find_stockfish(self):
+    def test_find_stockfish(self, analyzer):
         """Test Stockfish path detection."""
         # This will test the path finding logic
-        path = self.analyzer._find_stockfish()
+        path = _find_stockfish(analyzer)
 
         # Path should be None or a string
         assert path is None or isinstance(path, str)
 
-    def test_close_engine(self):
+    def test_close_engine(self, analyzer):
         """Test engine cleanup."""
         # Should not raise any exceptions
-        self.analyzer.close()
+        analyzer.close()
 
         # Should be safe to call multiple times
-        self.analyzer.close()
\ No newline at end of file
+        analyzer.close()
\ No newline at end of file
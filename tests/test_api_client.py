@@ -1,117 +1,126 @@
 """Tests for Chess.com API client."""
 
 import pytest
-from unittest.mock import Mock, patch
+import requests
+import responses
+from types import SimpleNamespace
 from src.api.client import ChessComClient
 
 
-class TestChessComClient:
-    """Test cases for ChessComClient."""
+API = ChessComClient.BASE_URL
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.client = ChessComClient()
 
-    def teardown_method(self):
-        """Clean up after tests."""
-        pass
+class TestChessComClient:
+    """Test cases for ChessComClient."""
 
-    @patch('src.api.client.requests.get')
-    def test_get_player_profile_success(self, mock_get):
+    def test_get_player_profile_success(self, api_client, mocked_requests):
         """Test successful player profile retrieval."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mocked_requests.add(responses.GET, f'{API}/player/testuser', json={
             'username': 'testuser',
             'name': 'Test User',
             'country': 'US'
-        }
-        mock_get.return_value = mock_response
+        })
 
-        result = self.client.get_player_profile('testuser')
+        result = api_client.get_player_profile('testuser')
 
         assert result['username'] == 'testuser'
         assert result['name'] == 'Test User'
-        mock_get.assert_called_once_with('https://api.chess.com/pub/player/testuser')
+        assert len(mocked_requests.calls) == 1
 
-    @patch('src.api.client.requests.get')
-    def test_get_player_profile_error(self, mock_get):
+    def test_get_player_profile_error(self, api_client, mocked_requests):
         """Test player profile retrieval with error."""
-        mock_get.side_effect = Exception('API Error')
+        mocked_requests.add(responses.GET, f'{API}/player/testuser', status=500)
 
-        with pytest.raises(Exception):
-            self.client.get_player_profile('testuser')
+        with pytest.raises(requests.HTTPError):
+            api_client.get_player_profile('testuser')
 
-    @patch('src.api.client.requests.get')
-    def test_get_game_archives_success(self, mock_get):
+    def test_get_game_archives_success(self, api_client, mocked_requests):
         """Test successful game archives retrieval."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mocked_requests.add(responses.GET, f'{API}/player/testuser/games/archives', json={
             'archives': [
-                'https://api.chess.com/pub/player/testuser/games/2024/01',
-                'https://api.chess.com/pub/player/testuser/games/2024/02'
+                f'{API}/player/testuser/games/2024/01',
+                f'{API}/player/testuser/games/2024/02'
             ]
-        }
-        mock_get.return_value = mock_response
+        })
 
-        result = self.client.get_game_archives('testuser')
+        result = api_client.get_game_archives('testuser')
 
         assert len(result) == 2
         assert '2024/01' in result[0]
 
-    @patch('src.api.client.requests.get')
-    def test_get_games_from_archive_success(self, mock_get):
+    def test_get_games_from_archive_success(self, api_client, mocked_requests):
         """Test successful games retrieval from archive."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
+        mocked_requests.add(responses.GET, f'{API}/player/testuser/games/2024/01', json={
             'games': [
                 {'pgn': '1. e4 e5', 'result': '1-0'},
                 {'pgn': '1. d4 d5', 'result': '0-1'}
             ]
-        }
-        mock_get.return_value = mock_response
+        })
 
-        result = self.client.get_games_from_archive('https://api.chess.com/pub/player/testuser/games/2024/01')
+        result = api_client.get_games_from_archive(f'{API}/player/testuser/games/2024/01')
 
         assert len(result) == 2
         assert result[0]['result'] == '1-0'
 
-    @patch('src.api.client.requests.get')
-    def test_get_all_games_with_date_filter(self, mock_get):
+    def test_get_all_games_with_date_filter(self, api_client, mocked_requests, mocker):
         """Test getting all games with date filtering."""
-        # Mock archives response
-        archives_response = Mock()
-        archives_response.json.return_value = {
-            'archives': ['https://api.chess.com/pub/player/testuser/games/2024/01']
-        }
-
-        # Mock games response
-        games_response = Mock()
-        games_response.json.return_value = {
+        mocker.patch('src.api.client.time.sleep')
+        mocked_requests.add(responses.GET, f'{API}/player/testuser/games/archives', json={
+            'archives': [f'{API}/player/testuser/games/2024/01']
+        })
+        mocked_requests.add(responses.GET, f'{API}/player/testuser/games/2024/01', json={
             'games': [
                 {'pgn': '1. e4 e5', 'end_time': 1704067200},  # 2024-01-01
                 {'pgn': '1. d4 d5', 'end_time': 1706745600}   # 2024-02-01
             ]
-        }
-
-        mock_get.side_effect = [archives_response, games_response]
+        })
 
         from datetime import datetime
         start_date = datetime(2024, 1, 15)
         end_date = datetime(2024, 1, 31)
 
-        result = self.client.get_all_games('testuser', start_date, end_date)
+        result = api_client.get_all_games('testuser', start_date, end_date)
 
         assert len(result) == 1  # Only the first game should be included
         assert result[0]['end_time'] == 1704067200
 
-    def test_rate_limiting(self):
+    def test_iter_games_skips_archives_outside_range(self, api_client, mocked_requests, mocker):
+        """Test that archives outside the date range are never fetched."""
+        mocker.patch('src.api.client.time.sleep')
+        mocked_requests.add(responses.GET, f'{API}/player/testuser/games/archives', json={
+            'archives': [
+                f'{API}/player/testuser/games/2023/12',
+                f'{API}/player/testuser/games/2024/01'
+            ]
+        })
+        mocked_requests.add(responses.GET, f'{API}/player/testuser/games/2024/01', json={
+            'games': [{'pgn': '1. e4 e5', 'end_time': 1704067200}]  # 2024-01-01
+        })
+
+        from datetime import datetime
+        progress = []
+        batches = list(api_client.iter_games('testuser', datetime(2024, 1, 1), datetime(2024, 1, 31),
+                                             on_archive=lambda done, total: progress.append((done, total))))
+
+        assert batches == [[{'pgn': '1. e4 e5', 'end_time': 1704067200}]]
+        assert len(mocked_requests.calls) == 2  # Archive list + January only
+        assert progress == [(1, 1)]
+
+    def test_rate_limiting(self, api_client, monkeypatch):
         """Test that rate limiting is enforced."""
-        import time
+        clock = [1000.0]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        # Swap the module's clock so no real time passes
+        monkeypatch.setattr('src.api.client.time', SimpleNamespace(time=lambda: clock[0], sleep=fake_sleep))
 
-        start_time = time.time()
-        self.client._rate_limit()
-        self.client._rate_limit()
-        end_time = time.time()
+        api_client._rate_limit()
+        clock[0] += 0.5
+        api_client._rate_limit()
 
-        # Should take at least 1 second due to rate limiting
-        assert end_time - start_time >= 1.0
\ No newline at end of file
+        # Only the second call waits, for the rest of the delay
+        assert sleeps == [pytest.approx(api_client.REQUEST_DELAY - 0.5)]
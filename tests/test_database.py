@@ -1,198 +1,184 @@
 """Tests for database operations."""
 
 import pytest
-import os
-import tempfile
-from src.db.database import ChessDatabase
+from src.db.database import ChessDatabase, ConnectionPool, pgn_hash
+from _helpers import _STARTPOS_FEN
 
 
-class TestChessDatabase:
-    """Test cases for ChessDatabase."""
+def _game(gid, pgn, ts, result, white, black, tc='600'):
+    """Build a game dict shaped like a Chess.com archive entry."""
+    return {
+        'url': f'https://www.chess.com/game/live/{gid}',
+        'pgn': pgn,
+        'end_time': ts,
+        'result': result,
+        'white': {'username': white},
+        'black': {'username': black},
+        'time_control': tc
+    }
+
+
+# Games shared by the read-only tests through seeded_db
+FIXTURE_GAMES = [
+    _game(1, '1. e4 e5', 1704067200, '1-0', 'testuser', 'opponent1'),  # 2024-01-01
+    _game(2, '1. d4 d5', 1706745600, '0-1', 'opponent2', 'testuser'),  # 2024-02-01
+    _game(12345, '1. e4 e5 2. Nf3 Nc6', 1704153600, '1-0', 'white_player', 'black_player'),  # 2024-01-02
+]
+
+
+@pytest.fixture
+def db():
+    """In-memory database, so tests never touch the disk."""
+    db = ChessDatabase(":memory:")
+    yield db
+    db.close()
+
 
-    def setup_method(self):
-        """Set up test database."""
-        self.db_file = tempfile.NamedTemporaryFile(delete=False)
-        self.db_file.close()
-        self.db = ChessDatabase(self.db_file.name)
+@pytest.fixture(scope="module")
+def seeded_db():
+    """In-memory database pre-populated with FIXTURE_GAMES.
 
-    def teardown_method(self):
-        """Clean up test database."""
-        if hasattr(self, 'db'):
-            self.db.close()
-        if os.path.exists(self.db_file.name):
-            os.unlink(self.db_file.name)
+    Built once per module, so only tests that don't write may use it.
+    """
+    db = ChessDatabase(":memory:")
+    db.insert_games_batch(FIXTURE_GAMES)
+    yield db
+    db.close()
 
-    def test_insert_game(self):
+
+@pytest.fixture
+def pool(tmp_path):
+    """Connection pool over an on-disk database.
+
+    Pooled connections must share one database, which :memory: can't do.
+    """
+    pool = ConnectionPool(str(tmp_path / "chess_games.db"), readers=2)
+    yield pool
+    pool.close()
+
+
+class TestChessDatabase:
+    """Test cases for ChessDatabase."""
+
+    def test_insert_game(self, db):
         """Test inserting a single game."""
-        game_data = {
-            'url': 'https://www.chess.com/game/live/12345',
-            'pgn': '1. e4 e5 2. Nf3 Nc6',
-            'end_time': 1704067200,
-            'result': '1-0',
-            'white': {'username': 'white_player'},
-            'black': {'username': 'black_player'},
-            'time_control': '600',
-            'end_time': 1704067200
-        }
-
-        self.db.insert_game(game_data)
+        game_data = _game(12345, '1. e4 e5 2. Nf3 Nc6', 1704067200, '1-0', 'white_player', 'black_player')
+
+        db.insert_game(game_data)
 
         # Verify game was inserted
-        game = self.db.get_game_by_id('12345')
+        game = db.get_game_by_id('12345')
         assert game is not None
         assert game['pgn'] == game_data['pgn']
         assert game['result'] == '1-0'
 
-    def test_insert_games_batch(self):
+    def test_insert_games_batch(self, db):
         """Test inserting multiple games."""
-        games_data = [
-            {
-                'url': 'https://www.chess.com/game/live/1',
-                'pgn': '1. e4 e5',
-                'end_time': 1704067200,
-                'result': '1-0',
-                'white': {'username': 'player1'},
-                'black': {'username': 'player2'},
-                'time_control': '600',
-                'end_time': 1704067200
-            },
-            {
-                'url': 'https://www.chess.com/game/live/2',
-                'pgn': '1. d4 d5',
-                'end_time': 1704153600,
-                'result': '0-1',
-                'white': {'username': 'player1'},
-                'black': {'username': 'player3'},
-                'time_control': '600',
-                'end_time': 1704153600
-            }
-        ]
-
-        self.db.insert_games_batch(games_data)
+        stored = db.insert_games_batch(FIXTURE_GAMES)
+        assert stored == len(FIXTURE_GAMES)
 
         # Verify games were inserted
-        games = self.db.get_games_by_username('player1')
+        games = db.get_games_by_username('testuser')
         assert len(games) == 2
 
-    def test_get_games_by_username(self):
-        """Test retrieving games by username."""
-        # Insert test games
-        games_data = [
-            {
-                'url': 'https://www.chess.com/game/live/1',
-                'pgn': '1. e4 e5',
-                'end_time': 1704067200,
-                'result': '1-0',
-                'white': {'username': 'testuser'},
-                'black': {'username': 'opponent1'},
-                'time_control': '600',
-                'end_time': 1704067200
-            },
-            {
-                'url': 'https://www.chess.com/game/live/2',
-                'pgn': '1. d4 d5',
-                'end_time': 1704153600,
-                'result': '0-1',
-                'white': {'username': 'opponent2'},
-                'black': {'username': 'testuser'},
-                'time_control': '600',
-                'end_time': 1704153600
-            }
-        ]
-
-        self.db.insert_games_batch(games_data)
+    def test_insert_games_batch_chunks(self, monkeypatch, db):
+        """Test that batches larger than BATCH_SIZE are fully stored."""
+        monkeypatch.setattr(ChessDatabase, 'BATCH_SIZE', 2)
+        games_data = [_game(i, '1. e4 e5', 1704067200 + i, '1-0', 'player1', 'player2') for i in range(5)]
+
+        assert db.insert_games_batch(games_data) == 5
+        assert len(db.get_games_by_username('player1')) == 5
+
+    def test_cache_analysis(self, db):
+        """Test caching analysis results."""
+        game_id = '12345'
+        move_number = 5
+        fen = _STARTPOS_FEN
+        evaluation = -50
+        best_move = 'e2e4'
+
+        db.cache_analysis(game_id, move_number, fen, evaluation, best_move)
 
         # Test retrieval
-        games = self.db.get_games_by_username('testuser')
+        cached = db.get_cached_analysis(game_id, move_number)
+        assert cached is not None
+        assert cached['evaluation'] == evaluation
+        assert cached['best_move'] == best_move
+
+        # Test non-existent cache
+        cached = db.get_cached_analysis(game_id, 999)
+        assert cached is None
+
+    def test_game_analysis_and_ai_cache(self, db):
+        """Test caching whole-game analysis and AI insights by PGN hash."""
+        h = pgn_hash('1. e4 e5 2. Nf3 Nc6')
+        analysis = {'moves': [], 'blunders': [], 'mistakes': [], 'summary': {'total_moves': 4}}
+
+        assert db.get_game_analysis_cache(h, 12) is None
+        assert db.get_ai_cache(h, 12) is None
+
+        db.put_game_analysis_cache(h, 12, analysis)
+        db.put_ai_cache(h, 12, 'Control the center.')
+
+        assert db.get_game_analysis_cache(h, 12) == analysis
+        assert db.get_game_analysis_cache(h, 15) is None  # Keyed by depth too
+        assert db.get_ai_cache(h, 12) == 'Control the center.'
+        assert db.get_ai_cache(h, 15) is None
+        assert db.get_ai_cache(pgn_hash('1. d4 d5'), 12) is None
+
+    def test_get_games_by_username(self, seeded_db):
+        """Test retrieving games by username."""
+        # testuser played white in one game and black in the other
+        games = seeded_db.get_games_by_username('testuser')
         assert len(games) == 2
 
         # Test limit
-        games_limited = self.db.get_games_by_username('testuser', limit=1)
+        games_limited = seeded_db.get_games_by_username('testuser', limit=1)
         assert len(games_limited) == 1
 
-    def test_get_games_by_date_range(self):
+    def test_get_games_by_date_range(self, seeded_db):
         """Test retrieving games by date range."""
         from datetime import datetime
 
-        # Insert test games
-        games_data = [
-            {
-                'url': 'https://www.chess.com/game/live/1',
-                'pgn': '1. e4 e5',
-                'end_time': 1704067200,  # 2024-01-01
-                'result': '1-0',
-                'white': {'username': 'testuser'},
-                'black': {'username': 'opponent'},
-                'time_control': '600',
-                'end_time': 1704067200
-            },
-            {
-                'url': 'https://www.chess.com/game/live/2',
-                'pgn': '1. d4 d5',
-                'end_time': 1706745600,  # 2024-02-01
-                'result': '0-1',
-                'white': {'username': 'testuser'},
-                'black': {'username': 'opponent'},
-                'time_control': '600',
-                'end_time': 1706745600
-            }
-        ]
-
-        self.db.insert_games_batch(games_data)
-
         # Test date range
         start_date = datetime(2024, 1, 15)
         end_date = datetime(2024, 1, 31)
 
-        games = self.db.get_games_by_date_range('testuser', start_date, end_date)
+        games = seeded_db.get_games_by_date_range('testuser', start_date, end_date)
         assert len(games) == 0  # No games in this range
 
         start_date = datetime(2024, 1, 1)
         end_date = datetime(2024, 1, 31)
 
-        games = self.db.get_games_by_date_range('testuser', start_date, end_date)
+        games = seeded_db.get_games_by_date_range('testuser', start_date, end_date)
         assert len(games) == 1  # Only the first game
 
-    def test_get_game_by_id(self):
+    def test_get_game_by_id(self, seeded_db):
         """Test retrieving a specific game by ID."""
-        game_data = {
-            'url': 'https://www.chess.com/game/live/12345',
-            'pgn': '1. e4 e5 2. Nf3 Nc6',
-            'end_time': 1704067200,
-            'result': '1-0',
-            'white': {'username': 'white_player'},
-            'black': {'username': 'black_player'},
-            'time_control': '600',
-            'end_time': 1704067200
-        }
-
-        self.db.insert_game(game_data)
-
-        # Test retrieval
-        game = self.db.get_game_by_id('12345')
+        game = seeded_db.get_game_by_id('12345')
         assert game is not None
         assert game['game_id'] == '12345'
 
         # Test non-existent game
-        game = self.db.get_game_by_id('99999')
+        game = seeded_db.get_game_by_id('99999')
         assert game is None
 
-    def test_cache_analysis(self):
-        """Test caching analysis results."""
-        game_id = '12345'
-        move_number = 5
-        fen = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
-        evaluation = -50
-        best_move = 'e2e4'
 
-        self.db.cache_analysis(game_id, move_number, fen, evaluation, best_move)
+class TestConnectionPool:
+    """Test cases for ConnectionPool."""
 
-        # Test retrieval
-        cached = self.db.get_cached_analysis(game_id, move_number)
-        assert cached is not None
-        assert cached['evaluation'] == evaluation
-        assert cached['best_move'] == best_move
+    def test_writes_visible_to_readers(self, pool):
+        """Test that games written through the writer are visible to readers."""
+        with pool.acquire(write=True) as db:
+            db.insert_games_batch([_game(1, '1. e4 e5', 1704067200, '1-0', 'player1', 'player2')])
 
-        # Test non-existent cache
-        cached = self.db.get_cached_analysis(game_id, 999)
-        assert cached is None
\ No newline at end of file
+        with pool.acquire() as db:
+            assert len(db.get_games_by_username('player1')) == 1
+
+    def test_reader_returned_to_pool(self, pool):
+        """Test that a reader is handed back after use."""
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            with pool.acquire() as third:
+                assert first in (second, third)
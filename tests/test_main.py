@@ -1,46 +1,46 @@
 """Tests for main CLI application."""
 
+import click
 import pytest
 from click.testing import CliRunner
 from src.main import cli
 
 
+@pytest.fixture(scope="module")
+def runner():
+    """CliRunner shared by the CLI tests; it keeps no state between invokes."""
+    return CliRunner()
+
+
 class TestMainCLI:
     """Test cases for main CLI application."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.runner = CliRunner()
-
-    def test_cli_help(self):
+    def test_cli_help(self, runner):
         """Test CLI help command."""
-        result = self.runner.invoke(cli, ['--help'])
+        result = runner.invoke(cli, ['--help'])
         assert result.exit_code == 0
         assert "Chess Analyzer" in result.output
         assert "Analyze your chess games" in result.output
 
-    def test_cli_version(self):
+    def test_cli_version(self, runner):
         """Test CLI version command."""
-        result = self.runner.invoke(cli, ['--version'])
+        result = runner.invoke(cli, ['--version'])
         assert result.exit_code == 0
         assert "0.1.0" in result.output
 
-    def test_fetch_command_requires_username(self):
-        """Test that fetch command requires username."""
-        result = self.runner.invoke(cli, ['fetch'])
+    @pytest.mark.parametrize("command,param_type", [
+        ('fetch', click.Argument),
+        ('analyze', click.Option),
+        ('stats', click.Option),
+    ])
+    def test_command_requires_username(self, command, param_type):
+        """Test that each command declares a required username."""
+        params = {param.name: param for param in cli.commands[command].params}
+        assert isinstance(params['username'], param_type)
+        assert params['username'].required
+
+    def test_missing_username_is_a_usage_error(self, runner):
+        """Test that Click rejects a command invoked without its username."""
+        result = runner.invoke(cli, ['fetch'])
         assert result.exit_code == 2  # Click error for missing argument
         assert "Missing argument" in result.output
-
-    def test_analyze_command_requires_username(self):
-        """Test that analyze command requires username."""
-        result = self.runner.invoke(cli, ['analyze'])
-        assert result.exit_code == 2  # Click error for missing option
-        assert "Missing option" in result.output
-        assert "--username" in result.output
-
-    def test_stats_command_requires_username(self):
-        """Test that stats command requires username."""
-        result = self.runner.invoke(cli, ['stats'])
-        assert result.exit_code == 2  # Click error for missing option
-        assert "Missing option" in result.output
-        assert "--username" in result.output
\ No newline at end of file
@@ -4,182 +4,264 @@ These tests validate that key endpoints respond and basic validation works
 without relying on background processing completing or external services.
 """
 
+import gzip
 import json
 import pytest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import src.web_app as web_app
+from _dummies import STORED_GAME, BrokenPool, DummyAI, DummyAnalyzer, DummyClient, DummyDB, DummyPool
 
 
-def _get_app():
-    # Import the app after environment is ready
-    from src.web_app import app
-    return app
+def _patch_all(mp, patches):
+    """Apply (target, name, value) patches in order through one MonkeyPatch."""
+    for target, name, value in patches:
+        mp.setattr(target, name, value)
+
+
+@pytest.fixture(autouse=True)
+def _reset_progress(monkeypatch):
+    """Start every test with no jobs and idle progress, restored afterwards.
+
+    Detaching the latest job also keeps jobs left running by earlier tests
+    from overwriting analysis_progress.
+    """
+    _patch_all(monkeypatch, [
+        (web_app, 'job_progress', {}),
+        (web_app, '_latest_job_id', None),
+        (web_app, 'analysis_progress', {"status": "idle", "progress": 0, "message": ""}),
+    ])
+
+
+@pytest.fixture
+def patched_backends(monkeypatch, app):
+    """Run jobs inline against a dummy Chess.com client and an empty dummy database.
+
+    Returns the database so tests can seed it or inspect what was stored.
+    """
+    db = DummyDB()
+    # Finish the job before the request returns
+    monkeypatch.setitem(app.config, 'SYNC_BACKGROUND', True)
+    monkeypatch.setattr(web_app, 'get_pool', lambda: DummyPool(db))
+    monkeypatch.setattr(web_app, 'current_client', DummyClient())
+    return db
 
 
 class TestWebApp:
-    def setup_method(self):
-        self.app = _get_app()
-        self.client = self.app.test_client()
+    @pytest.mark.parametrize("method,url,payload,check", [
+        ('GET', '/', None,
+         lambda r: b'Chess' in r.data and 'max-age' in r.headers.get('Cache-Control', '')),
+        ('GET', '/test', None, lambda r: r.get_json().get('status') == 'ok'),
+        ('POST', '/api/fetch_games', {'username': 'testuser'}, lambda r: r.get_json().get('success') is True),
+        # Provide username to avoid config fallback
+        ('POST', '/api/analyze_games', {'username': 'testuser'}, lambda r: r.get_json().get('success') is True),
+    ], ids=['index', 'health', 'fetch_games', 'analyze_games'])
+    def test_endpoint_smoke(self, patched_backends, web_client, method, url, payload, check):
+        resp = web_client.open(url, method=method, json=payload)
+        assert resp.status_code == 200
+        assert check(resp)
 
-    def test_index_page(self):
-        resp = self.client.get('/')
+    def test_index_page_gzip(self, web_client):
+        resp = web_client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
         assert resp.status_code == 200
-        assert b'Chess' in resp.data
+        assert resp.headers.get('Content-Encoding') == 'gzip'
+        assert 'Accept-Encoding' in resp.headers.get('Vary', '')
+        assert b'Chess' in gzip.decompress(resp.data)
 
-    def test_health_endpoint(self):
-        resp = self.client.get('/test')
+    def test_index_page_uncached_in_dev_mode(self, monkeypatch, app, web_client):
+        monkeypatch.setitem(app.config, 'TEMPLATES_AUTO_RELOAD', True)
+        resp = web_client.get('/')
         assert resp.status_code == 200
-        data = resp.get_json()
-        assert data.get('status') == 'ok'
+        assert 'Cache-Control' not in resp.headers
 
-    def test_progress_endpoint(self):
-        resp = self.client.get('/api/progress')
+    def test_progress_endpoint(self, app):
+        # Only the view's output matters, so skip the WSGI round trip
+        with app.test_request_context('/api/progress'):
+            resp = web_app.get_progress()
         assert resp.status_code == 200
         data = resp.get_json()
         assert 'status' in data
         assert 'progress' in data
 
-    def test_fetch_games_validation(self):
-        resp = self.client.post('/api/fetch_games',
-                                 data=json.dumps({}),
-                                 content_type='application/json')
+    def test_fetch_games_validation(self, monkeypatch, app):
+        # A rejected request must not build the clients or open the database
+        def fail():
+            raise AssertionError("components initialized for an invalid request")
+        monkeypatch.setattr(web_app, 'initialize_components', fail)
+        with app.test_request_context('/api/fetch_games', method='POST', json={}):
+            resp = web_app.fetch_games()
         assert resp.status_code == 200
         data = resp.get_json()
         assert data.get('success') is False
         assert 'error' in data
 
-    def test_fetch_games_accepts_username(self):
-        resp = self.client.post('/api/fetch_games',
-                                 data=json.dumps({'username': 'testuser'}),
-                                 content_type='application/json')
-        assert resp.status_code == 200
-        data = resp.get_json()
-        assert data.get('success') is True
-
-    def test_analyze_requires_or_uses_username(self):
-        # Provide username to avoid config fallback
-        resp = self.client.post('/api/analyze_games',
-                                 data=json.dumps({'username': 'testuser'}),
-                                 content_type='application/json')
-        assert resp.status_code == 200
-        data = resp.get_json()
-        assert data.get('success') is True
-
-    def test_save_and_load_credentials(self):
+    def test_save_and_load_credentials(self, monkeypatch, tmp_path, web_client):
+        _patch_all(monkeypatch, [
+            (web_app, 'initialize_components', lambda: True),
+            (web_app, 'current_client', None),
+            (web_app, 'CONFIG_PATH', tmp_path / 'config.local.ini'),
+            (web_app, '_cred_cache', None),
+        ])
         # Save
-        resp = self.client.post('/api/save_credentials',
-                                 data=json.dumps({'username': 'saveduser', 'password': 'pw'}),
-                                 content_type='application/json')
+        resp = web_client.post('/api/save_credentials', json={'username': 'saveduser', 'password': 'pw'})
         assert resp.status_code == 200
         data = resp.get_json()
         assert data.get('success') is True
 
         # Load
-        resp2 = self.client.get('/api/load_credentials')
+        resp2 = web_client.get('/api/load_credentials')
         assert resp2.status_code == 200
         data2 = resp2.get_json()
-        assert data2.get('username') in ('saveduser', '')  # allow empty in CI
+        assert data2.get('username') == 'saveduser'
 
-    def test_progress_polling_mock(self, monkeypatch):
-        # Import module to access globals
-        import src.web_app as web_app
+    def test_progress_polling_mock(self, monkeypatch, web_client):
         # Set a mocked progress
-        web_app.analysis_progress = {"status": "completed", "progress": 100, "message": "Done"}
-        resp = self.client.get('/api/progress')
+        monkeypatch.setattr(web_app, 'analysis_progress', {"status": "completed", "progress": 100, "message": "Done"})
+        resp = web_client.get('/api/progress')
         assert resp.status_code == 200
         data = resp.get_json()
         assert data.get('status') == 'completed'
         assert data.get('progress') == 100
 
-    def test_fetch_games_background_thread(self, monkeypatch):
-        # Avoid network/DB by monkeypatching client + DB methods
-        import src.web_app as web_app
-
-        def fake_get_all_games(username):
-            return [{
-                'url': 'https://www.chess.com/game/live/123',
-                'pgn': '1. e4 e5',
-                'end_time': 1704067200,
-                'result': '1-0',
-                'white': {'username': username},
-                'black': {'username': 'opponent'},
-                'time_control': '600'
-            }]
-
-        class DummyDB:
-            def __init__(self, *a, **k):
-                pass
-            def insert_games_batch(self, games):
-                return None
-            def close(self):
-                return None
-
-        monkeypatch.setattr(web_app, 'current_client', web_app.current_client or object())
-        monkeypatch.setattr(web_app.current_client.__class__, 'get_all_games', staticmethod(fake_get_all_games), raising=False)
-        # Patch constructor used inside thread
-        import importlib
-        db_module = importlib.import_module('db.database')
-        monkeypatch.setattr(db_module, 'ChessDatabase', DummyDB)
-
-        resp = self.client.post('/api/fetch_games',
-                                 data=json.dumps({'username': 'testuser'}),
-                                 content_type='application/json')
+    def test_progress_by_job_id(self, patched_backends, web_client):
+        resp = web_client.post('/api/fetch_games', json={'username': 'testuser'})
+        job_id = resp.get_json().get('job_id')
+        assert job_id
+
+        data = web_client.get(f'/api/progress?job_id={job_id}').get_json()
+        assert data.get('status') == 'completed'
+
+        resp = web_client.get('/api/progress?job_id=unknown')
+        assert resp.status_code == 404
+
+    def test_progress_stream(self, monkeypatch, web_client):
+        monkeypatch.setattr(web_app, 'analysis_progress', {"status": "completed", "progress": 100, "message": "Done"})
+
+        resp = web_client.get('/api/progress/stream')
         assert resp.status_code == 200
+        assert resp.mimetype == 'text/event-stream'
+        event = resp.get_data(as_text=True).strip()
+        assert event.startswith('data: ')
+        assert json.loads(event[len('data: '):])['status'] == 'completed'
 
-        # Poll a few times to allow thread to update progress
-        import time
-        for _ in range(10):
-            data = self.client.get('/api/progress').get_json()
-            if data.get('status') in ('completed', 'error'):
-                break
-            time.sleep(0.05)
-        assert data.get('status') in ('completed', 'error')
-
-    def test_analyze_games_background_thread(self, monkeypatch):
-        import src.web_app as web_app
-        # Reset progress to avoid interference from other tests
-        web_app.analysis_progress = {"status": "idle", "progress": 0, "message": ""}
-
-        class DummyDB:
-            def __init__(self, *a, **k):
-                pass
-            def get_games_by_username(self, username, limit=None):
-                return [{
-                    'game_id': 'g1',
-                    'pgn': '1. e4 e5',
-                    'result': '1-0'
-                }]
-            def close(self):
-                return None
-
-        class DummyAnalyzer:
-            def analyze_game(self, pgn):
-                return {'summary': {'total_moves': 2, 'blunder_count': 0, 'mistake_count': 0, 'accuracy': 100.0},
-                        'blunders': [], 'mistakes': [], 'moves': []}
-
-        class DummyAI:
-            def get_chess_advice(self, pgn, analysis):
-                return 'Advice'
-
-        # Patch analyzer and AI globals
-        monkeypatch.setattr(web_app, 'current_analyzer', DummyAnalyzer())
-        monkeypatch.setattr(web_app, 'current_ai', DummyAI())
-        # Patch DB constructor
-        import importlib
-        db_module = importlib.import_module('db.database')
-        monkeypatch.setattr(db_module, 'ChessDatabase', DummyDB)
-
-        resp = self.client.post('/api/analyze_games',
-                                 data=json.dumps({'username': 'testuser'}),
-                                 content_type='application/json')
+    def test_progress_stream_unknown_job(self, web_client):
+        resp = web_client.get('/api/progress/stream?job_id=unknown')
+        assert resp.status_code == 404
+        assert resp.get_json()['status'] == 'error'
+
+    def test_fetch_games_background_thread(self, patched_backends, web_client):
+        resp = web_client.post('/api/fetch_games', json={'username': 'testuser'})
+        assert resp.status_code == 200
+        job_id = resp.get_json()['job_id']
+
+        data = web_client.get(f'/api/progress?job_id={job_id}').get_json()
+        assert data.get('status') == 'completed'
+        assert data.get('message') == 'Stored 1 games for testuser'
+        assert len(patched_backends.games) == 1
+
+    def test_fetch_games_range_reports_archive_progress(self, monkeypatch, patched_backends, web_client):
+        states = []
+        set_progress = web_app._set_progress
+
+        def record(job_id, state):
+            states.append(state)
+            set_progress(job_id, state)
+        monkeypatch.setattr(web_app, '_set_progress', record)
+
+        resp = web_client.post('/api/fetch_games', json={
+            'username': 'testuser', 'mode': 'range', 'startDate': '2024-01-01', 'endDate': '2024-01-31'
+        })
+        assert resp.status_code == 200
+
+        assert [s['message'] for s in states if s['message'].startswith('Fetched')] == [
+            'Fetched 1/1 monthly archives, stored 0 games so far...'
+        ]
+        assert states[-1] == {"status": "completed", "progress": 100, "message": "Stored 1 games for testuser"}
+        assert len(patched_backends.games) == 1
+
+    def test_analyze_games_background_thread(self, monkeypatch, patched_backends, web_client):
+        patched_backends.insert_games_batch([STORED_GAME])
+        # Run the analysis pool in-process with a dummy worker analyzer
+        _patch_all(monkeypatch, [
+            (web_app, 'EXECUTOR', ThreadPoolExecutor(max_workers=1)),
+            (web_app, '_worker_analyzer', DummyAnalyzer()),
+            (web_app, 'current_ai', DummyAI()),
+        ])
+
+        resp = web_client.post('/api/analyze_games', json={'username': 'testuser'})
         assert resp.status_code == 200
+        job_id = resp.get_json()['job_id']
 
-        # Poll until done
-        import time
-        for _ in range(40):
-            data = self.client.get('/api/progress').get_json()
-            # Ensure we wait for the analyze completion, not prior fetch completion
-            if data.get('status') == 'completed' and str(data.get('message', '')).startswith('Analysis complete'):
-                break
-            time.sleep(0.05)
+        # Ask for this job by id so a prior job's progress can't satisfy the check
+        data = web_client.get(f'/api/progress?job_id={job_id}').get_json()
         assert data.get('status') == 'completed'
+        assert data.get('message', '').startswith('Analysis complete')
         assert isinstance(data.get('results'), list)
         assert data['results'] and any(r.get('game_id') == 'g1' for r in data['results'])
+
+    def test_analyze_games_replaces_broken_pool(self, monkeypatch, patched_backends, web_client):
+        patched_backends.insert_games_batch([STORED_GAME])
+        broken = BrokenPool()
+        executors = iter([broken, ThreadPoolExecutor(max_workers=1)])
+        reset = []
+        _patch_all(monkeypatch, [
+            (web_app, '_get_executor', lambda: next(executors)),
+            (web_app, '_reset_executor', reset.append),
+            (web_app, '_worker_analyzer', DummyAnalyzer()),
+            (web_app, 'current_ai', DummyAI()),
+        ])
+
+        job_id = web_client.post('/api/analyze_games', json={'username': 'testuser'}).get_json()['job_id']
+
+        data = web_client.get(f'/api/progress?job_id={job_id}').get_json()
+        assert data.get('status') == 'completed'
+        assert [r['game_id'] for r in data['results']] == ['g1']
+        assert reset == [broken]
+
+    @pytest.mark.slow
+    def test_analyze_games_in_process_pool(self, monkeypatch, patched_backends, web_client):
+        """Test the real pool path: worker initializer, _analyze_one and pool replacement."""
+        patched_backends.insert_games_batch([STORED_GAME])
+        _patch_all(monkeypatch, [
+            (web_app, 'EXECUTOR', BrokenPool()),
+            (web_app, 'ANALYSIS_WORKERS', 1),
+            (web_app, 'current_ai', DummyAI()),
+        ])
+
+        try:
+            job_id = web_client.post('/api/analyze_games', json={'username': 'testuser'}).get_json()['job_id']
+            # The broken pool was swapped for a real one
+            assert isinstance(web_app.EXECUTOR, ProcessPoolExecutor)
+        finally:
+            if isinstance(web_app.EXECUTOR, ProcessPoolExecutor):
+                web_app.EXECUTOR.shutdown()
+
+        data = web_client.get(f'/api/progress?job_id={job_id}').get_json()
+        assert data.get('status') == 'completed'
+        analysis = data['results'][0]['analysis']
+        assert analysis['summary']['total_moves'] == 2
+
+    @pytest.mark.parametrize("engine,summary,expected", [
+        (object(), {'failed_searches': 0}, True),
+        (object(), {'failed_searches': 1}, False),  # A search raised and scored 0
+        (None, {'failed_searches': 0}, False),  # Material-only fallback
+    ], ids=['engine', 'failed_search', 'no_engine'])
+    def test_analysis_cacheable(self, engine, summary, expected):
+        analyzer = DummyAnalyzer()
+        analyzer.engine = engine
+        assert web_app._analysis_cacheable({'summary': summary}, analyzer) is expected
+
+    @pytest.mark.parametrize("analysis_cacheable,insights,expected", [
+        (True, 'Advice', True),
+        (False, 'Advice', False),  # Built on an analysis that is never cached
+        (True, 'Fallback', False),  # Local fallback, not the Grok API
+    ], ids=['grok', 'uncacheable_analysis', 'fallback'])
+    def test_ai_insights_cacheable(self, monkeypatch, analysis_cacheable, insights, expected):
+        class GrokAI(DummyAI):
+            def is_available(self):
+                return True
+
+            def _get_fallback_advice(self, analysis):
+                return 'Fallback'
+
+        monkeypatch.setattr(web_app, 'current_ai', GrokAI())
+        assert web_app._ai_insights_cacheable({}, insights, analysis_cacheable) is expected